@@ -5,3 +5,12 @@ class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
 
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_migrate
+
+        from . import signals  # noqa: F401
+        from . import search, sqlite
+
+        connection_created.connect(sqlite.configure_connection, dispatch_uid='api.sqlite.configure_connection')
+        post_migrate.connect(search.ensure_installed, sender=self, dispatch_uid='api.search.ensure_installed')
@@ -0,0 +1,53 @@
+"""Helpers shared by the bench_* management commands"""
+import math
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import setup_databases, teardown_databases
+
+from .instrumentation import QueryRecorder
+
+
+@contextmanager
+def scratch_database(verbosity=0, on_disk=False):
+    """
+    Run the block against a throwaway test database, like the test runner.
+
+    SQLite test databases live in memory by default; pass on_disk=True for
+    benchmarks that need real file locking between threads or processes.
+    """
+    test_settings = connection.settings_dict['TEST']
+    old_name = test_settings.get('NAME')
+    if on_disk and connection.vendor == 'sqlite':
+        fd, path = tempfile.mkstemp(prefix='sudhaar-bench-', suffix='.sqlite3')
+        os.close(fd)
+        test_settings['NAME'] = path
+    old_config = setup_databases(verbosity=verbosity, interactive=False, aliases={'default'})
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=verbosity)
+        test_settings['NAME'] = old_name
+
+
+def measure(func, iterations=1):
+    """Run `func` and return (queries per call, milliseconds per call)"""
+    # Counts every execution; CaptureQueriesContext stops at the 9000
+    # entries connection.queries keeps and under-reports long runs
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - started
+    return recorder.count / iterations, elapsed * 1000 / iterations
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(math.ceil(fraction * len(sorted_values)) - 1, 0)]
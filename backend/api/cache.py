@@ -0,0 +1,110 @@
+"""
+Versioned response cache for public read endpoints.
+
+Every cached response key embeds the current version of the namespaces it
+depends on ('issues', 'campaigns', 'donations'). Writes bump the version
+(see signals.py), which orphans the old entries instead of hunting them
+down, so invalidation is O(1) and works the same on the local-memory and
+file-based cache backends.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+VERSION_KEY = 'respcache:version:{}'
+STATS_KEY = 'respcache:{}:{}'
+# Backends whose entries live inside one process: bumps made by other
+# workers and by management commands never reach them
+PER_PROCESS_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def is_shared():
+    """Whether every worker and command sees the same namespace versions"""
+    return settings.CACHES['default']['BACKEND'] not in PER_PROCESS_BACKENDS
+
+
+def get_version(namespace):
+    key = VERSION_KEY.format(namespace)
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock so an evicted counter never reuses old versions
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump(*namespaces):
+    """Invalidate every cached response that depends on `namespaces`"""
+    for namespace in namespaces:
+        key = VERSION_KEY.format(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, int(time.time() * 1000), timeout=None)
+
+
+def record(name, outcome):
+    key = STATS_KEY.format(name, outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def get_stats(names):
+    """Return {name: {'hits': n, 'misses': n}}"""
+    return {
+        name: {
+            'hits': cache.get(STATS_KEY.format(name, 'hit'), 0),
+            'misses': cache.get(STATS_KEY.format(name, 'miss'), 0),
+        }
+        for name in names
+    }
+
+
+def reset_stats(names):
+    cache.delete_many([STATS_KEY.format(name, outcome) for name in names for outcome in ('hit', 'miss')])
+
+
+def cached_response(name, namespaces, anonymous_only=True):
+    """
+    Cache a GET handler's response data under the current namespace versions.
+
+    With anonymous_only, authenticated requests bypass the cache because
+    their payload can depend on the user (e.g. user_has_upvoted).
+    """
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method != 'GET' or (anonymous_only and request.user.is_authenticated):
+                return handler(self, request, *args, **kwargs)
+
+            versions = ':'.join(str(get_version(ns)) for ns in namespaces)
+            url = request.build_absolute_uri()
+            key = f'respcache:{name}:{versions}:' + hashlib.md5(url.encode()).hexdigest()
+            data = cache.get(key)
+            if data is not None:
+                record(name, 'hit')
+                response = Response(data)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            record(name, 'miss')
+            response = handler(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+
+# Names used by cached_response in views.py, for the stats command
+CACHED_ENDPOINTS = ['issue-list', 'issue-stats', 'campaign-list', 'transparency-summary']
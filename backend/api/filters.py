@@ -0,0 +1,63 @@
+from django.db import connection
+from rest_framework.filters import SearchFilter, OrderingFilter
+
+from . import search
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    `?search=` backed by SQLite FTS5 for views that declare `search_fts_table`.
+
+    Matches are prefix queries ranked with bm25 and exposed as `search_rank`
+    (lower is better). Other views, databases without FTS5 and searches with no
+    words fall back to DRF's LIKE-based SearchFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        fts_table = getattr(view, 'search_fts_table', None)
+        match = search.build_match(self.get_search_terms(request))
+        if not fts_table or match is None or not search.is_supported(connection):
+            return super().filter_queryset(request, queryset, view)
+
+        weights = ', '.join(str(w) for w in getattr(view, 'search_fts_weights', ()))
+        bm25 = f'bm25("{fts_table}", {weights})' if weights else f'bm25("{fts_table}")'
+        model_table = queryset.model._meta.db_table
+        # A join lets FTS5 drive the lookup instead of scanning the model table
+        return queryset.extra(
+            select={'search_rank': bm25},
+            tables=[fts_table],
+            where=[f'"{fts_table}".rowid = "{model_table}"."id"', f'"{fts_table}" MATCH %s'],
+            params=[match],
+        )
+
+
+class RankedOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that sorts full-text matches by relevance unless ?ordering= is given.
+
+    Views can also declare `ordering_aliases`, e.g. {'trending': ['-trending_score']},
+    to expose named orderings backed by precomputed, indexed columns.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        aliases = getattr(view, 'ordering_aliases', None)
+        params = request.query_params.get(self.ordering_param)
+        if aliases and params:
+            fields = []
+            for term in params.split(','):
+                term = term.strip()
+                fields.extend(aliases.get(term, [term]))
+            ordering = self.remove_invalid_fields(queryset, fields, view, request)
+            if ordering:
+                return ordering
+        return super().get_ordering(request, queryset, view)
+
+    def get_default_ordering(self, view):
+        ordering = super().get_default_ordering(view)
+        if getattr(self, '_ranked', False):
+            return ['search_rank', *(ordering or [])]
+        return ordering
+
+    def filter_queryset(self, request, queryset, view):
+        self._ranked = 'search_rank' in queryset.query.extra
+        return super().filter_queryset(request, queryset, view)
@@ -0,0 +1,158 @@
+"""
+Geohash helpers for spatial lookups on plain SQLite.
+
+A geohash interleaves latitude and longitude bits into a base32 string, so
+points in the same cell share a prefix and every cell is one contiguous
+range of the index on `Issue.geohash`. Bounding-box and radius queries are
+answered by covering the area with a handful of cells and turning them into
+indexed range scans, then trimming the candidates exactly.
+"""
+import math
+
+from django.db.models import Q
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+DEFAULT_PRECISION = 9
+EARTH_RADIUS_KM = 6371.0088
+
+
+def encode(latitude, longitude, precision=DEFAULT_PRECISION):
+    """Return the geohash of a point"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    latitude, longitude = float(latitude), float(longitude)
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        rng, value = (lng_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def decode_bounds(geohash):
+    """Return (min_lat, min_lng, max_lat, max_lng) of a geohash cell"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = BASE32.index(char)
+        for shift in range(4, -1, -1):
+            rng = lng_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if value >> shift & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return lat_range[0], lng_range[0], lat_range[1], lng_range[1]
+
+
+def cell_size(precision):
+    """Return (lat_degrees, lng_degrees) covered by one cell at `precision`"""
+    bits = precision * 5
+    lng_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def covering_cells(min_lat, min_lng, max_lat, max_lng, max_cells=32, max_precision=DEFAULT_PRECISION):
+    """
+    Return geohash cells covering the box, at the finest precision up to
+    `max_precision` that needs no more than `max_cells` cells.
+
+    Cells are prefix ranges, so they only match geohashes at least as long
+    as themselves: callers looking up shorter cells pass their length as
+    `max_precision`.
+    """
+    precision = 1
+    for candidate in range(min(max_precision, DEFAULT_PRECISION), 0, -1):
+        lat_step, lng_step = cell_size(candidate)
+        rows = math.floor(max_lat / lat_step) - math.floor(min_lat / lat_step) + 1
+        cols = math.floor(max_lng / lng_step) - math.floor(min_lng / lng_step) + 1
+        if rows * cols <= max_cells:
+            precision = candidate
+            break
+
+    lat_step, lng_step = cell_size(precision)
+    cells = set()
+    lat = min_lat
+    while True:
+        lng = min_lng
+        while True:
+            cells.add(encode(lat, lng, precision))
+            if lng >= max_lng:
+                break
+            lng = min(lng + lng_step, max_lng)
+        if lat >= max_lat:
+            break
+        lat = min(lat + lat_step, max_lat)
+    return sorted(cells)
+
+
+def _next_prefix(prefix):
+    """Smallest string sorting after every geohash that starts with `prefix`"""
+    while prefix and prefix[-1] == BASE32[-1]:
+        prefix = prefix[:-1]
+    if not prefix:
+        return None
+    return prefix[:-1] + BASE32[BASE32.index(prefix[-1]) + 1]
+
+
+def cell_ranges(cells):
+    """Merge sorted cells into contiguous [start, end) string ranges"""
+    ranges = []
+    for cell in sorted(cells):
+        end = _next_prefix(cell)
+        if ranges and ranges[-1][1] == cell:
+            ranges[-1][1] = end
+        else:
+            ranges.append([cell, end])
+    return [tuple(r) for r in ranges]
+
+
+def radius_bounds(latitude, longitude, radius_km):
+    """Return the (min_lat, min_lng, max_lat, max_lng) box around a circle"""
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    lng_delta = min(180.0, lat_delta / cos_lat)
+    return (
+        max(-90.0, latitude - lat_delta), max(-180.0, longitude - lng_delta),
+        min(90.0, latitude + lat_delta), min(180.0, longitude + lng_delta),
+    )
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance between two points in kilometres"""
+    lat1, lng1, lat2, lng2 = map(math.radians, (float(lat1), float(lng1), float(lat2), float(lng2)))
+    a = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def filter_bounds(queryset, min_lat, min_lng, max_lat, max_lng, max_cells=32):
+    """Restrict an Issue queryset to a box using geohash index ranges"""
+    cells_q = Q()
+    for start, end in cell_ranges(covering_cells(min_lat, min_lng, max_lat, max_lng, max_cells)):
+        cell_q = Q(geohash__gte=start)
+        if end is not None:
+            cell_q &= Q(geohash__lt=end)
+        cells_q |= cell_q
+    return queryset.filter(
+        cells_q,
+        latitude__gte=min_lat, latitude__lte=max_lat,
+        longitude__gte=min_lng, longitude__lte=max_lng,
+    )
@@ -0,0 +1,34 @@
+"""
+"Hot" ranking for the issue feed.
+
+Scores follow Reddit's shape: the log of an issue's weighted activity plus
+a term that grows linearly with its creation time. Ten times the activity
+is worth DECAY_SECONDS of recency, so a new urgent report overtakes an old
+issue with many votes within hours instead of never. Because the age term
+is anchored to a fixed epoch rather than to "now", stored scores stay
+comparable without rewriting every row as time passes; they only change
+when the issue's own votes, comments, priority or status change.
+"""
+import math
+from datetime import datetime, timezone
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+DECAY_SECONDS = 45000
+COMMENT_WEIGHT = 2
+# Boosts in orders of magnitude of activity (1.0 = ten times the votes)
+PRIORITY_BOOST = {'Critical': 1.0, 'High': 0.5, 'Medium': 0.2}
+CLOSED_STATUSES = ('Resolved', 'Rejected')
+CLOSED_PENALTY = 2.0
+
+# Issue columns score() depends on, in argument order
+FIELDS = ('upvotes', 'comment_count', 'priority', 'status', 'created_at')
+
+
+def score(upvotes, comment_count, priority, status, created_at):
+    activity = 1 + max(upvotes, 0) + COMMENT_WEIGHT * max(comment_count, 0)
+    boost = PRIORITY_BOOST.get(priority, 0.0)
+    if status == 'Critical':
+        boost = max(boost, PRIORITY_BOOST['Critical'])
+    elif status in CLOSED_STATUSES:
+        boost -= CLOSED_PENALTY
+    return math.log10(activity) + boost + (created_at - EPOCH).total_seconds() / DECAY_SECONDS
@@ -0,0 +1,142 @@
+"""
+Opt-in per-request SQL instrumentation.
+
+With SQL_INSTRUMENTATION enabled, every query a request runs goes through a
+connection.execute_wrapper that only counts and times it, keyed by the raw
+SQL string. Fingerprinting (collapsing IN lists and literals so queries of
+the same shape compare equal) happens once per distinct string when the
+response goes out, so the per-query cost stays at two perf_counter calls
+and a dict update.
+
+Each response gets a `Server-Timing` header (db time and query count, plus
+a `db-repeats` metric when some shape ran more than SQL_REPEAT_THRESHOLD
+times) and one JSON line on the `api.sql` logger. Requests with repeated
+shapes - usually an N+1 in a serializer - are logged at WARNING with the
+offending SQL.
+"""
+import json
+import logging
+import re
+import time
+from contextlib import ExitStack
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('api.sql')
+
+DEFAULT_REPEAT_THRESHOLD = 5
+# Longest SQL excerpt written to the log per repeated shape
+SQL_EXCERPT = 300
+
+_IN_LIST = re.compile(r'\bIN \((?:%s|\?)(?:, ?(?:%s|\?))*\)', re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'(?<![\w."])-?\d+(?:\.\d+)?\b')
+_SPACE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql):
+    """Normalize SQL so that queries differing only in parameters compare equal"""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _SPACE.sub(' ', sql).strip()
+
+
+class QueryRecorder:
+    """execute_wrapper that counts and times queries by their SQL string"""
+
+    __slots__ = ('count', 'duration', 'by_sql')
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.by_sql = {}  # sql -> [executions, seconds]
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            entry = self.by_sql.get(sql)
+            if entry is None:
+                self.by_sql[sql] = [1, elapsed]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+
+    def shapes(self):
+        """Return {fingerprint: [executions, seconds]}"""
+        shapes = {}
+        for sql, (executions, seconds) in self.by_sql.items():
+            entry = shapes.setdefault(fingerprint(sql), [0, 0.0])
+            entry[0] += executions
+            entry[1] += seconds
+        return shapes
+
+    def repeated(self, threshold):
+        """Shapes that ran more than `threshold` times, most frequent first"""
+        return sorted(
+            ((shape, executions, seconds) for shape, (executions, seconds) in self.shapes().items()
+             if executions > threshold),
+            key=lambda item: -item[1],
+        )
+
+
+def server_timing(recorder, repeated, total):
+    metrics = [
+        f'db;dur={recorder.duration * 1000:.2f};desc="{recorder.count} quer{"y" if recorder.count == 1 else "ies"}"',
+        f'app;dur={max(total - recorder.duration, 0) * 1000:.2f}',
+    ]
+    if repeated:
+        metrics.append(f'db-repeats;desc="{len(repeated)} repeated shapes, max {repeated[0][1]}x"')
+    return ', '.join(metrics)
+
+
+class SQLInstrumentationMiddleware:
+    """Record the SQL each request runs; enabled by settings.SQL_INSTRUMENTATION"""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SQL_INSTRUMENTATION', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold = getattr(settings, 'SQL_REPEAT_THRESHOLD', DEFAULT_REPEAT_THRESHOLD)
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        repeated = recorder.repeated(self.threshold)
+        response['Server-Timing'] = server_timing(recorder, repeated, total)
+
+        match = request.resolver_match
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'queries': recorder.count,
+            'db_ms': round(recorder.duration * 1000, 2),
+            'total_ms': round(total * 1000, 2),
+        }
+        if repeated:
+            record['repeated'] = [
+                {'count': executions, 'db_ms': round(seconds * 1000, 2), 'sql': shape[:SQL_EXCERPT]}
+                for shape, executions, seconds in repeated
+            ]
+            logger.warning(json.dumps(record))
+        else:
+            logger.info(json.dumps(record))
+        return response
@@ -0,0 +1,168 @@
+import json
+import platform
+import random
+import subprocess
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api import synthetic
+from api.benchmarks import percentile, scratch_database
+from api.instrumentation import QueryRecorder
+from api.models import Campaign, Issue, User
+
+# (name, user kind, path template); {issue}, {campaign} and {term} are drawn per request
+ENDPOINTS = [
+    ('issues: list (anonymous, cached)', None, '/api/issues/'),
+    ('issues: list', 'citizen', '/api/issues/'),
+    ('issues: list ?ordering=hot', 'citizen', '/api/issues/?ordering=hot'),
+    ('issues: list ?status=', 'citizen', '/api/issues/?status=In%20Progress'),
+    ('issues: list ?pagination=cursor', 'citizen', '/api/issues/?pagination=cursor&ordering=-upvotes'),
+    ('issues: search', 'citizen', '/api/issues/?search={term}'),
+    ('issues: detail', 'citizen', '/api/issues/{issue}/'),
+    ('issues: comments', 'citizen', '/api/issues/{issue}/comments/'),
+    ('issues: timeline', 'citizen', '/api/issues/{issue}/timeline/'),
+    ('issues: stats', None, '/api/issues/stats/'),
+    ('issues: clusters', None, '/api/issues/clusters/?zoom=8&bbox=73.8,31.0,75.0,32.5'),
+    ('dashboard: stats', 'citizen', '/api/dashboard/stats/'),
+    ('campaigns: list', 'citizen', '/api/campaigns/'),
+    ('campaigns: list ?ordering=trending', 'citizen', '/api/campaigns/?ordering=trending'),
+    ('campaigns: detail', 'citizen', '/api/campaigns/{campaign}/'),
+    ('campaigns: donations', 'citizen', '/api/campaigns/{campaign}/donations/'),
+    ('donations: own', 'citizen', '/api/donations/'),
+    ('donations: all (staff)', 'staff', '/api/donations/'),
+    ('transparency: summary', None, '/api/transparency/summary/'),
+]
+SEARCH_TERMS = ['pothole', 'sewer', 'water', 'lights', 'school', 'lahore', 'garbage', 'transformer']
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=settings.BASE_DIR, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = ('Seed synthetic data (10k, 100k, 1M issues...) and report per-endpoint latency '
+            'percentiles, throughput and query counts as JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', action='append', default=None,
+                            help='Number of issues to seed, e.g. 10k, 100k or 1M; repeat for several '
+                                 'runs (default 10k)')
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per endpoint')
+        parser.add_argument('--endpoint', action='append', default=None,
+                            help='Only run endpoints whose name contains this text (repeatable)')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--live', action='store_true',
+                            help='Benchmark the data already in the configured database instead of seeding '
+                                 'a scratch database')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        if options['live'] and options['scale']:
+            raise CommandError('--live benchmarks the existing data; it cannot be combined with --scale')
+        try:
+            scales = [synthetic.parse_scale(scale) for scale in options['scale'] or ['10k']]
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        endpoints = [
+            endpoint for endpoint in ENDPOINTS
+            if not options['endpoint'] or any(text in endpoint[0] for text in options['endpoint'])
+        ]
+        if not endpoints:
+            raise CommandError('No endpoint matches --endpoint')
+
+        report = {
+            'commit': git_commit(),
+            'started_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'requests_per_endpoint': options['requests'],
+            'runs': [],
+        }
+        for scale in [None] if options['live'] else scales:
+            with nullcontext() if options['live'] else scratch_database(on_disk=True):
+                run = {'scale': scale}
+                if scale is not None:
+                    self.stderr.write(f'Seeding {scale} issues...')
+                    started = time.perf_counter()
+                    run['rows'] = synthetic.generate(scale, seed=options['seed'], log=self.stderr.write)
+                    run['seed_seconds'] = round(time.perf_counter() - started, 1)
+                # DEBUG would record every query in connection.queries and skew the timings
+                with override_settings(DEBUG=False, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                    run['endpoints'] = self.run_endpoints(endpoints, options)
+                report['runs'].append(run)
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            Path(options['output']).write_text(output + '\n')
+            self.stderr.write(f'Wrote {options["output"]}')
+        else:
+            self.stdout.write(output)
+
+    def run_endpoints(self, endpoints, options):
+        rng = random.Random(options['seed'])
+        issue_ids = list(Issue.objects.values_list('pk', flat=True))
+        issue_ids = rng.sample(issue_ids, min(1000, len(issue_ids)))
+        campaign_ids = list(Campaign.objects.filter(is_verified=True).values_list('pk', flat=True))
+        if not issue_ids or not campaign_ids:
+            raise CommandError('The database needs issues and verified campaigns to benchmark against')
+        citizen = User.objects.filter(role='citizen', donations__isnull=False).first()
+        official = User.objects.filter(role='official').first()
+        if citizen is None or official is None:
+            raise CommandError('The database needs a citizen with donations and an official to benchmark with')
+        official.is_staff = True  # in memory only; force_authenticate uses the instance as given
+        clients = {None: APIClient()}
+        for kind, user in (('citizen', citizen), ('staff', official)):
+            clients[kind] = APIClient()
+            clients[kind].force_authenticate(user)
+
+        results = {}
+        for name, kind, template in endpoints:
+            def request():
+                path = template.format(issue=rng.choice(issue_ids), campaign=rng.choice(campaign_ids),
+                                       term=rng.choice(SEARCH_TERMS))
+                return clients[kind].get(path)
+
+            for _ in range(options['warmup']):
+                request()
+            latencies, queries, statuses = [], [], {}
+            started = time.perf_counter()
+            for _ in range(options['requests']):
+                recorder = QueryRecorder()
+                with connection.execute_wrapper(recorder):
+                    request_started = time.perf_counter()
+                    response = request()
+                    latencies.append((time.perf_counter() - request_started) * 1000)
+                queries.append(recorder.count)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            elapsed = time.perf_counter() - started
+
+            latencies.sort()
+            results[name] = {
+                'p50_ms': round(percentile(latencies, 0.50), 2),
+                'p95_ms': round(percentile(latencies, 0.95), 2),
+                'p99_ms': round(percentile(latencies, 0.99), 2),
+                'max_ms': round(latencies[-1], 2),
+                'requests_per_second': round(len(latencies) / elapsed, 1),
+                'queries_mean': round(sum(queries) / len(queries), 2),
+                'queries_max': max(queries),
+                'status': {str(code): count for code, count in sorted(statuses.items())},
+            }
+            self.stderr.write(f'{name:<38} p50 {results[name]["p50_ms"]:>8.2f} ms  '
+                              f'p99 {results[name]["p99_ms"]:>8.2f} ms  '
+                              f'{results[name]["queries_mean"]:>6.1f} queries')
+        return results
@@ -0,0 +1,107 @@
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand
+from django.db import models
+from django.db.models.signals import post_save
+
+from api import signals
+from api.benchmarks import measure, scratch_database
+from api.models import User, Issue, IssueTimeline, IssueUpvote
+
+# Issue receivers added since the previous save(); the baseline ran without them
+RECEIVERS = (signals.update_map_clusters, signals.update_status_counts, signals.invalidate_issue_responses)
+
+
+class Command(BaseCommand):
+    help = 'Compare the queries issued by each Issue.save() path against the previous full-row save'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+
+    def handle(self, *args, **options):
+        with scratch_database():
+            self.run(options['iterations'])
+
+    def run(self, iterations):
+        author = User.objects.create_user(email='bench@example.com', username='bench', password='bench')
+        issue = Issue.objects.create(
+            title='Benchmark issue', description='Benchmark', location='Lahore',
+            category='Roads', author=author,
+        )
+        statuses = ['In Progress', 'Open']
+
+        def legacy_save(instance):
+            # What Issue.save() did before: re-fetch, diff status, full-row UPDATE
+            old = Issue.objects.get(pk=instance.pk)
+            if old.status != instance.status:
+                IssueTimeline.objects.create(issue=instance, status=instance.status)
+            models.Model.save(instance)
+
+        def edit_title(save):
+            def run():
+                obj = Issue.objects.get(pk=issue.pk)
+                obj.title = obj.title[::-1]
+                save(obj)
+            return run
+
+        def change_status(save):
+            def run():
+                obj = Issue.objects.get(pk=issue.pk)
+                obj.status = statuses[obj.status == statuses[0]]
+                save(obj)
+            return run
+
+        def unchanged(save):
+            def run():
+                save(Issue.objects.get(pk=issue.pk))
+            return run
+
+        def upvote_legacy():
+            # The previous upvote / remove_upvote view bodies
+            obj = Issue.objects.get(pk=issue.pk)
+            IssueUpvote.objects.get_or_create(user=author, issue=obj)
+            obj.upvotes += 1
+            legacy_save(obj)
+            IssueUpvote.objects.get(user=author, issue=obj).delete()
+            obj.upvotes = max(0, obj.upvotes - 1)
+            legacy_save(obj)
+
+        def upvote_current():
+            obj = Issue.objects.get(pk=issue.pk)
+            obj.add_upvote(author)
+            obj.remove_upvote(author)
+
+        paths = [
+            ('edit title', edit_title(legacy_save), edit_title(Issue.save)),
+            ('status transition', change_status(legacy_save), change_status(Issue.save)),
+            ('unchanged save', unchanged(legacy_save), unchanged(Issue.save)),
+            ('upvote + remove', upvote_legacy, upvote_current),
+        ]
+
+        @contextmanager
+        def baseline():
+            status = Issue.objects.values_list('status', flat=True).get(pk=issue.pk)
+            for receiver in RECEIVERS:
+                post_save.disconnect(receiver, sender=Issue)
+            try:
+                yield
+            finally:
+                for receiver in RECEIVERS:
+                    post_save.connect(receiver, sender=Issue)
+                # Status changes made without the receivers never reached the
+                # counters; put the row back where the counters expect it
+                Issue.objects.filter(pk=issue.pk).update(status=status)
+
+        self.stdout.write(f"{'path':<20} {'before q':>9} {'after q':>8} {'before ms':>10} {'after ms':>9}")
+        for name, before, after in paths:
+            with baseline():
+                before_q, before_ms = measure(before, iterations)
+            after_q, after_ms = measure(after, iterations)
+            self.stdout.write(
+                f'{name:<20} {before_q:>9.1f} {after_q:>8.1f} {before_ms:>10.3f} {after_ms:>9.3f}'
+            )
+        self.stdout.write('Query counts include the SELECT that loads the issue and any BEGIN (COMMIT is not a cursor execute).')
+        self.stdout.write(
+            'After, a status transition also moves the issue between two IssueStatusCount rows '
+            '(insert-if-missing and UPDATE each) and upvotes refresh hot_score; the baseline did neither.'
+        )
@@ -0,0 +1,128 @@
+import multiprocessing
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+
+from api import synthetic
+from api.benchmarks import percentile, scratch_database
+from api.models import Comment, Issue, User
+from api.sqlite import current_pragmas
+
+# (name, PRAGMAs, keep the connection between operations)
+PROFILES = [
+    # What the development settings get: rollback journal, a new connection per request
+    ('default', {'journal_mode': 'DELETE'}, False),
+    ('production', None, True),  # settings.SQLITE_PRODUCTION_PRAGMAS
+]
+
+
+def read(rng, issue_ids, user_ids):
+    list(Issue.objects.select_related('author').order_by('-created_at')[:20])
+    Issue.objects.filter(pk=rng.choice(issue_ids)).select_related('author').first()
+    list(Comment.objects.filter(issue_id=rng.choice(issue_ids)).order_by('-created_at', '-id')[:20])
+
+
+def write(rng, issue_ids, user_ids):
+    issue = Issue(pk=rng.choice(issue_ids))
+    if rng.random() < 0.7:
+        issue.add_upvote(User(pk=rng.choice(user_ids)))
+    else:
+        Comment.objects.create(issue=issue, user_id=rng.choice(user_ids), text='Still not fixed.')
+
+
+def worker(role, index, pragmas, persistent, duration, start, results):
+    """Run reads or writes for `duration` seconds; report (role, latencies, locked, other errors)"""
+    settings.SQLITE_PRAGMAS = pragmas
+    connections.close_all()  # never share the parent's connection
+    rng = random.Random(index)
+    issue_ids = list(Issue.objects.values_list('pk', flat=True))
+    user_ids = list(User.objects.filter(role='citizen').values_list('pk', flat=True))
+    operation = read if role == 'reader' else write
+    if not persistent:
+        connections.close_all()
+    latencies, locked, errors = [], 0, 0
+    start.wait()
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            operation(rng, issue_ids, user_ids)
+            latencies.append((time.perf_counter() - started) * 1000)
+        except OperationalError as exc:
+            if 'locked' in str(exc) or 'busy' in str(exc):
+                locked += 1
+            else:
+                errors += 1
+        if not persistent:
+            connections.close_all()  # like CONN_MAX_AGE = 0 at the end of a request
+    connections.close_all()
+    results.put((role, latencies, locked, errors))
+
+
+class Command(BaseCommand):
+    help = ('Run concurrent reader and writer processes against an on-disk SQLite database with '
+            'the default and the production connection profile')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=6, help='Reader processes')
+        parser.add_argument('--writers', type=int, default=2, help='Writer processes')
+        parser.add_argument('--duration', type=float, default=10, help='Seconds per profile')
+        parser.add_argument('--issues', default='5k', help='Issues to seed before each run')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('bench_sqlite_concurrency needs the SQLite backend')
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise CommandError('bench_sqlite_concurrency needs the fork start method (Linux or macOS)')
+        try:
+            issues = synthetic.parse_scale(options['issues'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        context = multiprocessing.get_context('fork')
+
+        configured = settings.SQLITE_PRAGMAS
+        try:
+            rows = [row for profile in PROFILES for row in self.run_profile(*profile, issues, context, options)]
+        finally:
+            settings.SQLITE_PRAGMAS = configured
+
+        self.stdout.write(f"{'profile':<11} {'role':<7} {'ops/s':>8} {'p50 ms':>8} {'p99 ms':>9} "
+                          f"{'locked':>7} {'errors':>7}")
+        for name, role, rate, p50, p99, locked, errors in rows:
+            self.stdout.write(f'{name:<11} {role:<7} {rate:>8.0f} {p50:>8.2f} {p99:>9.2f} {locked:>7} {errors:>7}')
+
+    def run_profile(self, name, pragmas, persistent, issues, context, options):
+        pragmas = settings.SQLITE_PRODUCTION_PRAGMAS if pragmas is None else pragmas
+        with scratch_database(on_disk=True):
+            self.stderr.write(f'[{name}] seeding {issues} issues...')
+            synthetic.generate(issues, seed=options['seed'])
+            settings.SQLITE_PRAGMAS = pragmas
+            connections.close_all()
+            self.stderr.write(f'[{name}] {current_pragmas(connection, ["journal_mode", "synchronous"])}')
+            connections.close_all()
+
+            start, results = context.Event(), context.Queue()
+            processes = [
+                context.Process(target=worker, args=(role, index, pragmas, persistent,
+                                                     options['duration'], start, results))
+                for index, role in enumerate(['reader'] * options['readers'] + ['writer'] * options['writers'])
+            ]
+            for process in processes:
+                process.start()
+            start.set()
+            reports = [results.get() for _ in processes]
+            for process in processes:
+                process.join()
+
+        rows = []
+        for role in ('reader', 'writer'):
+            latencies = sorted(ms for report_role, values, _, _ in reports if report_role == role for ms in values)
+            locked = sum(report[2] for report in reports if report[0] == role)
+            errors = sum(report[3] for report in reports if report[0] == role)
+            rows.append((name, role, len(latencies) / options['duration'], percentile(latencies, 0.5),
+                         percentile(latencies, 0.99), locked, errors))
+        return rows
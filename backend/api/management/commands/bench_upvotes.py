@@ -0,0 +1,85 @@
+import random
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections, OperationalError
+
+from api.benchmarks import scratch_database
+from api.models import User, Issue, IssueUpvote, PendingUpvote
+
+
+class Command(BaseCommand):
+    help = 'Stress the synchronous and write-behind upvote paths on a few trending issues'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--votes', type=int, default=2000, help='Votes per mode')
+        parser.add_argument('--issues', type=int, default=3, help='Number of trending issues')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        with scratch_database(on_disk=True):
+            users, issues = self.setup_data(options['votes'], options['issues'])
+            rng = random.Random(options['seed'])
+            votes = [(rng.choice(users), rng.choice(issues)) for _ in range(options['votes'])]
+
+            sync = self.run_mode('synchronous', votes, options['threads'],
+                                 lambda user, issue: issue.add_upvote(user))
+            self.verify()
+            self.reset()
+
+            buffered = self.run_mode('write-behind', votes, options['threads'],
+                                     lambda user, issue: PendingUpvote.enqueue(issue, user, PendingUpvote.UPVOTE))
+            started = time.perf_counter()
+            while PendingUpvote.flush():
+                pass
+            flush_seconds = time.perf_counter() - started
+            self.verify()
+
+        self.stdout.write(f"{'mode':<14} {'votes/s':>10} {'locked':>7}")
+        for name, rate, errors in (sync, buffered):
+            self.stdout.write(f'{name:<14} {rate:>10.0f} {errors:>7}')
+        self.stdout.write(f'Draining the buffer took {flush_seconds * 1000:.1f} ms')
+
+    def setup_data(self, votes, issue_count):
+        users = User.objects.bulk_create(
+            User(email=f'voter{i}@example.com', username=f'voter{i}') for i in range(votes // 2)
+        )
+        author = users[0]
+        issues = [
+            Issue.objects.create(title=f'Trending {i}', description='-', location='-',
+                                 category='Roads', author=author)
+            for i in range(issue_count)
+        ]
+        return users, issues
+
+    def run_mode(self, name, votes, thread_count, cast):
+        errors = []
+
+        def worker(chunk):
+            for user, issue in chunk:
+                try:
+                    cast(user, issue)
+                except OperationalError:
+                    errors.append(1)
+            connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(votes[i::thread_count],)) for i in range(thread_count)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        return name, len(votes) / elapsed, len(errors)
+
+    def verify(self):
+        for issue in Issue.objects.all():
+            actual = IssueUpvote.objects.filter(issue=issue).count()
+            if issue.upvotes != actual:
+                self.stderr.write(f'Count drift on issue {issue.pk}: {issue.upvotes} != {actual}')
+
+    def reset(self):
+        IssueUpvote.objects.all().delete()
+        Issue.objects.update(upvotes=0)
@@ -0,0 +1,32 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.models import PendingUpvote
+
+
+class Command(BaseCommand):
+    help = 'Apply buffered upvotes (UPVOTE_WRITE_BEHIND) to issues in batched transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep running and flush every --interval seconds')
+        parser.add_argument('--interval', type=float, default=settings.UPVOTE_FLUSH_INTERVAL)
+        parser.add_argument('--batch-size', type=int, default=settings.UPVOTE_FLUSH_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        while True:
+            flushed = self.drain(options['batch_size'])
+            if flushed:
+                self.stdout.write(f'Flushed {flushed} buffered upvote(s)')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+    def drain(self, batch_size):
+        total = 0
+        while True:
+            flushed = PendingUpvote.flush(batch_size)
+            total += flushed
+            if flushed < batch_size:
+                return total
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api import settlements
+
+
+class Command(BaseCommand):
+    help = 'Import a payment-gateway settlement file (CSV or NDJSON) as donations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', dest='file_format', choices=settlements.FORMATS,
+                            help='Defaults to the file extension (.csv, .ndjson, .jsonl)')
+        parser.add_argument('--chunk-size', type=int, default=settlements.DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--show-rejected', type=int, default=50, help='How many rejected rows to list')
+
+    def handle(self, *args, **options):
+        file_format = options['file_format'] or settlements.guess_format(options['path'])
+        if file_format is None:
+            raise CommandError('Cannot tell the file format from its name; pass --format')
+
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+                report = settlements.ingest(settlements.read_rows(stream, file_format), options['chunk_size'])
+        except (OSError, settlements.SettlementError) as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(
+            f"{report['rows']} row(s) in {report['seconds']:.2f}s ({report['rows_per_second']:.0f} rows/s): "
+            f"{report['created']} created, {report['duplicates']} duplicate(s), "
+            f"{len(report['rejected'])} rejected"
+        )
+        self.stdout.write(f"Added {report['amount']} to {report['campaigns']} campaign(s)")
+        for line_number, reason in report['rejected'][:options['show_rejected']]:
+            self.stdout.write(self.style.WARNING(f'  line {line_number}: {reason}'))
+        hidden = len(report['rejected']) - options['show_rejected']
+        if hidden > 0:
+            self.stdout.write(self.style.WARNING(f'  ... and {hidden} more'))
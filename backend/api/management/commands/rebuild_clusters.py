@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.models import Issue, MapCluster
+
+
+class Command(BaseCommand):
+    help = 'Recompute the MapCluster aggregates from the issue table'
+
+    def handle(self, *args, **options):
+        totals = {}
+        located = Issue.objects.filter(geohash__isnull=False).values_list(
+            'geohash', 'category', 'status', 'latitude', 'longitude'
+        )
+        for geohash, category, status, latitude, longitude in located.iterator(chunk_size=5000):
+            for precision in MapCluster.CLUSTER_PRECISIONS:
+                key = (geohash[:precision], category, status)
+                row = totals.setdefault(key, [0, 0.0, 0.0])
+                row[0] += 1
+                row[1] += float(latitude)
+                row[2] += float(longitude)
+
+        with transaction.atomic():
+            MapCluster.objects.all().delete()
+            MapCluster.objects.bulk_create(
+                (
+                    MapCluster(precision=len(cell), cell=cell, category=category, status=status,
+                               count=count, latitude_sum=lat_sum, longitude_sum=lng_sum)
+                    for (cell, category, status), (count, lat_sum, lng_sum) in totals.items()
+                ),
+                batch_size=2000,
+            )
+        self.stdout.write(f'Rebuilt {len(totals)} cluster rows')
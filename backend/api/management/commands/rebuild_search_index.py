@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from api import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the FTS5 full-text indexes for issues and campaigns'
+
+    def handle(self, *args, **options):
+        if not search.is_supported(connection):
+            raise CommandError('Full-text indexes are only available on SQLite.')
+        with transaction.atomic():
+            search.install(connection)
+            search.rebuild(connection)
+        self.stdout.write(self.style.SUCCESS('Search indexes rebuilt'))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from api import cache
+from api.models import Campaign, Donation
+
+
+class Command(BaseCommand):
+    help = 'Recompute campaign raised amounts and donor counts from donations and report drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Overwrite the stored totals with the recomputed values')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            actual = {
+                row['campaign']: (row['raised'], row['donors'])
+                for row in Donation.objects.order_by().values('campaign').annotate(
+                    raised=Sum('amount'), donors=Count('donor', distinct=True)
+                )
+            }
+
+            drifted = []
+            for campaign in Campaign.objects.only('id', 'title', 'raised_amount', 'donor_count').order_by('id'):
+                raised, donors = actual.get(campaign.pk, (0, 0))
+                if campaign.raised_amount != raised or campaign.donor_count != donors:
+                    self.stdout.write(
+                        f'#{campaign.pk} {campaign.title}: stored {campaign.raised_amount} from '
+                        f'{campaign.donor_count} donor(s), actual {raised} from {donors}'
+                    )
+                    campaign.raised_amount, campaign.donor_count = raised, donors
+                    campaign.updated_at = timezone.now()
+                    drifted.append(campaign)
+
+            if not drifted:
+                self.stdout.write(self.style.SUCCESS('Campaign totals match the donation table'))
+                return
+
+            if options['fix']:
+                Campaign.objects.bulk_update(drifted, ['raised_amount', 'donor_count', 'updated_at'], batch_size=500)
+                transaction.on_commit(lambda: cache.bump('campaigns'))
+                self.stdout.write(self.style.WARNING(f'Fixed {len(drifted)} drifted campaign(s)'))
+            else:
+                self.stdout.write(self.style.WARNING(f'{len(drifted)} campaign(s) drifted; rerun with --fix to repair'))
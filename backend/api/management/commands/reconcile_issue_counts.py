@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from api import cache
+from api.models import Issue, IssueStatusCount
+
+
+class Command(BaseCommand):
+    help = 'Recompute issue counts per status and category and report drift from IssueStatusCount'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Overwrite the counters with the recomputed values')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            actual = {
+                (row['status'], row['category']): row['n']
+                for row in Issue.objects.order_by().values('status', 'category').annotate(n=Count('id'))
+            }
+            stored = {
+                (row.status, row.category): row.count
+                for row in IssueStatusCount.objects.all()
+            }
+
+            drift = []
+            for key in sorted(set(actual) | set(stored)):
+                expected, found = actual.get(key, 0), stored.get(key, 0)
+                if expected != found:
+                    drift.append((key, found, expected))
+                    self.stdout.write(f'{key[0]}/{key[1]}: stored {found}, actual {expected}')
+
+            if not drift:
+                self.stdout.write(self.style.SUCCESS('Issue counters match the issue table'))
+                return
+
+            if options['fix']:
+                IssueStatusCount.objects.all().delete()
+                IssueStatusCount.objects.bulk_create(
+                    IssueStatusCount(status=status, category=category, count=count)
+                    for (status, category), count in actual.items()
+                )
+                # Cached stats responses were built from the drifted counters
+                transaction.on_commit(lambda: cache.bump('issues'))
+                self.stdout.write(self.style.WARNING(f'Fixed {len(drift)} drifted counter(s)'))
+            else:
+                self.stdout.write(self.style.WARNING(f'{len(drift)} counter(s) drifted; rerun with --fix to repair'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api import trending
+
+
+class Command(BaseCommand):
+    help = 'Decay campaign trending scores and prune expired donation buckets (run e.g. every 10 minutes)'
+
+    def handle(self, *args, **options):
+        rescored, pruned = trending.refresh_all()
+        self.stdout.write(f'Rescored {rescored} campaign(s), pruned {pruned} expired bucket(s)')
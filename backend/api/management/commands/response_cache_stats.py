@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api import cache
+
+
+class Command(BaseCommand):
+    help = 'Show hit/miss counters for the cached public endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Zero the counters after printing them')
+
+    def handle(self, *args, **options):
+        if not cache.is_shared():
+            # This process has its own empty cache; the server's counters are elsewhere
+            raise CommandError(
+                f"{settings.CACHES['default']['BACKEND']} keeps counters inside each server process; "
+                'use GET /api/cache/stats/ as staff, or configure a shared cache backend'
+            )
+        stats = cache.get_stats(cache.CACHED_ENDPOINTS)
+        self.stdout.write(f"{'endpoint':<22} {'hits':>8} {'misses':>8} {'hit rate':>9}")
+        for name, counts in stats.items():
+            total = counts['hits'] + counts['misses']
+            rate = f"{counts['hits'] / total:.1%}" if total else '-'
+            self.stdout.write(f"{name:<22} {counts['hits']:>8} {counts['misses']:>8} {rate:>9}")
+        if options['reset']:
+            cache.reset_stats(cache.CACHED_ENDPOINTS)
@@ -0,0 +1,55 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from api import synthetic
+
+
+class Command(BaseCommand):
+    help = 'Fill the database with generated users, issues, campaigns and donations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--issues', default='200', help='Number of issues, e.g. 500, 10k or 1M (default 200)')
+        parser.add_argument('--citizens', help='Number of citizen accounts (default: issues / 5, at least 100)')
+        parser.add_argument('--ngos', help='Number of NGO accounts (default: issues / 2000, at least 5)')
+        parser.add_argument('--officials', help='Number of official accounts (default: issues / 20000, at least 3)')
+        parser.add_argument('--campaigns', help='Number of campaigns (default: issues / 200, at least 10)')
+        parser.add_argument('--donations', help='Number of donations (default: issues / 2, at least 100)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; the same seed gives the same data')
+        parser.add_argument('--password', default=synthetic.DEFAULT_PASSWORD,
+                            help='Password of every seeded account (hashed once)')
+        parser.add_argument('--batch-size', type=int, default=synthetic.BATCH_SIZE)
+        parser.add_argument('--no-demo-accounts', action='store_true',
+                            help='Skip the named demo accounts listed in DUMMY_USERS.md')
+        parser.add_argument('--flush', action='store_true',
+                            help='Empty the database (including superusers) before seeding')
+
+    def handle(self, *args, **options):
+        try:
+            counts = {
+                name: synthetic.parse_scale(options[name])
+                for name in ('issues', 'citizens', 'ngos', 'officials', 'campaigns', 'donations')
+                if options[name] is not None
+            }
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        if options['batch_size'] <= 0:
+            raise CommandError('--batch-size must be positive')
+
+        if options['flush']:
+            call_command('flush', interactive=False, verbosity=0)
+            self.stdout.write('Flushed the database')
+
+        started = time.perf_counter()
+        inserted = synthetic.generate(
+            counts.pop('issues'), seed=options['seed'], batch_size=options['batch_size'],
+            password=options['password'], demo_accounts=not options['no_demo_accounts'],
+            log=self.stdout.write if options['verbosity'] > 1 else lambda message: None,
+            **counts,
+        )
+        summary = ', '.join(f'{count} {table.replace("_", " ")}' for table, count in inserted.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {summary} in {time.perf_counter() - started:.1f}s'
+        ))
+        self.stdout.write(f'Every seeded account uses the password {options["password"]!r}')
@@ -0,0 +1,65 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from api import cache
+from api.replicas import replica_aliases
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database onto the local replica files with the SQLite backup API'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', action='append', dest='aliases',
+                            help='Replica alias to refresh (default: every alias in DATABASE_REPLICAS)')
+        parser.add_argument('--loop', action='store_true', help='Keep syncing until interrupted')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds between syncs with --loop')
+        parser.add_argument('--pages', type=int, default=1024,
+                            help='Pages copied per step; the primary stays writable between steps')
+
+    def handle(self, *args, **options):
+        aliases = options['aliases'] or replica_aliases()
+        if not aliases:
+            raise CommandError('No replicas configured; set DATABASE_REPLICAS (e.g. SQLITE_REPLICA=1)')
+        for alias in aliases:
+            if alias not in connections or connections[alias].vendor != 'sqlite':
+                raise CommandError(f'{alias!r} is not a SQLite database alias')
+        if connections['default'].vendor != 'sqlite':
+            raise CommandError('sync_replica copies SQLite files; use your database\'s own replication')
+
+        synced_version = None
+        while True:
+            # data_version changes whenever another connection commits to the
+            # primary; this connection stays open between syncs to compare it
+            version = self.data_version()
+            if version != synced_version:
+                started = time.perf_counter()
+                for alias in aliases:
+                    self.sync(alias, options['pages'])
+                synced_version = version
+                # Responses cached while the replica lagged may hold stale rows.
+                # Only after a real change: every bump empties the response cache.
+                cache.bump('issues', 'campaigns', 'donations')
+                if options['verbosity'] > 1 or not options['loop']:
+                    self.stdout.write(f'Synced {", ".join(aliases)} in {(time.perf_counter() - started) * 1000:.0f} ms')
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
+
+    def data_version(self):
+        with connections['default'].cursor() as cursor:
+            cursor.execute('PRAGMA data_version')
+            return cursor.fetchone()[0]
+
+    def sync(self, alias, pages):
+        source = connections['default']
+        source.ensure_connection()
+        # Close our own connection to the replica so the copy is not blocked by it
+        connections[alias].close()
+        target = sqlite3.connect(str(connections[alias].settings_dict['NAME']))
+        try:
+            source.connection.backup(target, pages=pages)
+        finally:
+            target.close()
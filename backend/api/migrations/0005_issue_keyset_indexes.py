@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_alter_issue_category'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['created_at', 'id'], name='issue_created_at_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['upvotes', 'id'], name='issue_upvotes_id_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_issue_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingUpvote',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.SmallIntegerField(choices=[(1, 'Upvote'), (-1, 'Remove upvote')])),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('issue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pending_upvotes', to='api.issue')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:26
+
+from django.db import migrations, models
+
+# Same encoding as api/geo.py at the time of writing
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+PRECISION = 9
+
+
+def encode(latitude, longitude):
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    latitude, longitude = float(latitude), float(longitude)
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < PRECISION:
+        rng, value = (lng_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def backfill_geohash(apps, schema_editor):
+    Issue = apps.get_model('api', 'Issue')
+    located = Issue.objects.filter(latitude__isnull=False, longitude__isnull=False)
+    batch = []
+    for issue in located.only('id', 'latitude', 'longitude').iterator(chunk_size=2000):
+        issue.geohash = encode(issue.latitude, issue.longitude)
+        batch.append(issue)
+        if len(batch) >= 2000:
+            Issue.objects.bulk_update(batch, ['geohash'])
+            batch = []
+    Issue.objects.bulk_update(batch, ['geohash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_pendingupvote'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12, null=True),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+    ]
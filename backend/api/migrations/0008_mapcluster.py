@@ -0,0 +1,54 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:27
+
+from django.db import migrations, models
+
+
+def populate_clusters(apps, schema_editor):
+    Issue = apps.get_model('api', 'Issue')
+    MapCluster = apps.get_model('api', 'MapCluster')
+    totals = {}
+    located = Issue.objects.filter(geohash__isnull=False).values_list(
+        'geohash', 'category', 'status', 'latitude', 'longitude'
+    )
+    for geohash, category, status, latitude, longitude in located.iterator(chunk_size=5000):
+        for precision in range(1, 8):
+            row = totals.setdefault((geohash[:precision], category, status), [0, 0.0, 0.0])
+            row[0] += 1
+            row[1] += float(latitude)
+            row[2] += float(longitude)
+    MapCluster.objects.bulk_create(
+        (
+            MapCluster(precision=len(cell), cell=cell, category=category, status=status,
+                       count=count, latitude_sum=lat_sum, longitude_sum=lng_sum)
+            for (cell, category, status), (count, lat_sum, lng_sum) in totals.items()
+        ),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_issue_geohash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MapCluster',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('precision', models.PositiveSmallIntegerField()),
+                ('cell', models.CharField(max_length=12)),
+                ('category', models.CharField(max_length=50)),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('latitude_sum', models.FloatField(default=0)),
+                ('longitude_sum', models.FloatField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['precision', 'cell'], name='mapcluster_precision_cell_idx')],
+                'unique_together': {('cell', 'category', 'status')},
+            },
+        ),
+        migrations.RunPython(populate_clusters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+from api import search
+
+
+def create_fts_indexes(apps, schema_editor):
+    if search.is_supported(schema_editor.connection):
+        search.install(schema_editor.connection)
+        search.rebuild(schema_editor.connection)
+
+
+def drop_fts_indexes(apps, schema_editor):
+    if search.is_supported(schema_editor.connection):
+        search.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_mapcluster'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_indexes, drop_fts_indexes),
+    ]
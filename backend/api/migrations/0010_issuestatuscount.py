@@ -0,0 +1,37 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:29
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_counts(apps, schema_editor):
+    Issue = apps.get_model('api', 'Issue')
+    IssueStatusCount = apps.get_model('api', 'IssueStatusCount')
+    grouped = Issue.objects.order_by().values('status', 'category').annotate(n=Count('id'))
+    IssueStatusCount.objects.bulk_create(
+        IssueStatusCount(status=row['status'], category=row['category'], count=row['n'])
+        for row in grouped
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_fulltext_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueStatusCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(max_length=20)),
+                ('category', models.CharField(max_length=50)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('status', 'category')},
+            },
+        ),
+        migrations.RunPython(populate_counts, migrations.RunPython.noop),
+    ]
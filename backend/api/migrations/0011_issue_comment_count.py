@@ -0,0 +1,35 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:33
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# SQLite rebuilds api_issue to add the column, which drops its FTS triggers;
+# the post_migrate receiver api.search.ensure_installed puts them back.
+
+def populate_comment_counts(apps, schema_editor):
+    Issue = apps.get_model('api', 'Issue')
+    Comment = apps.get_model('api', 'Comment')
+    counts = (Comment.objects.filter(issue=OuterRef('pk')).order_by()
+              .values('issue').annotate(n=Count('id')).values('n'))
+    Issue.objects.update(comment_count=Coalesce(Subquery(counts, output_field=IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_issuestatuscount'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['issue', 'created_at', 'id'], name='comment_issue_created_id_idx'),
+        ),
+        migrations.RunPython(populate_comment_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_issue_comment_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='issuetimeline',
+            index=models.Index(fields=['issue', 'created_at', 'id'], name='timeline_issue_created_id_idx'),
+        ),
+    ]
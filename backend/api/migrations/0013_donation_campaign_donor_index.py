@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_issuetimeline_issue_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['campaign', 'donor'], name='donation_campaign_donor_idx'),
+        ),
+    ]
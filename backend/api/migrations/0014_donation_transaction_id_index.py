@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_donation_campaign_donor_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='donation',
+            name='transaction_id',
+            field=models.CharField(blank=True, db_index=True, max_length=255, null=True),
+        ),
+    ]
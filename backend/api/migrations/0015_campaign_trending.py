@@ -0,0 +1,94 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:39
+
+import math
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+# SQLite rebuilds api_campaign to add a column, which drops its FTS triggers;
+# the post_migrate receiver api.search.ensure_installed puts them back.
+
+
+def drop_ngo_name_trigger(apps, schema_editor):
+    # This trigger lives on api_user but reads api_campaign, and SQLite refuses
+    # to rename the rebuilt table into place while it exists
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TRIGGER IF EXISTS api_campaign_fts_ngo_au')
+
+
+def populate_trending(apps, schema_editor):
+    Campaign = apps.get_model('api', 'Campaign')
+    Donation = apps.get_model('api', 'Donation')
+    CampaignDonationBucket = apps.get_model('api', 'CampaignDonationBucket')
+    now = timezone.now()
+    hourly = (Donation.objects.filter(created_at__gte=now - timedelta(days=7)).order_by()
+              .annotate(bucket=TruncHour('created_at')).values('campaign', 'bucket')
+              .annotate(amount=Sum('amount'), donations=Count('id')))
+    buckets = [
+        CampaignDonationBucket(campaign_id=row['campaign'], hour=row['bucket'],
+                               amount=row['amount'], donations=row['donations'])
+        for row in hourly
+    ]
+    CampaignDonationBucket.objects.bulk_create(buckets, batch_size=2000)
+
+    # Same windows and weights as api/trending.py at the time of writing
+    windows = ((timedelta(hours=1), 4.0), (timedelta(hours=24), 2.0), (timedelta(days=7), 1.0))
+    totals = {}
+    for bucket in buckets:
+        per_window = totals.setdefault(bucket.campaign_id, [[0.0, 0] for _ in windows])
+        for (window, _), total in zip(windows, per_window):
+            if bucket.hour >= (now - window).replace(minute=0, second=0, microsecond=0):
+                total[0] += float(bucket.amount)
+                total[1] += bucket.donations
+    for campaign_id, per_window in totals.items():
+        score = sum(weight * (math.log10(1 + amount) + 2.0 * math.log10(1 + donations))
+                    for (_, weight), (amount, donations) in zip(windows, per_window))
+        Campaign.objects.filter(pk=campaign_id).update(trending_score=score)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_donation_transaction_id_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_ngo_name_trigger, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='CampaignDonationBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('donations', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='campaign',
+            name='trending_score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(fields=['trending_score', 'id'], name='campaign_trending_idx'),
+        ),
+        migrations.AddField(
+            model_name='campaigndonationbucket',
+            name='campaign',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='donation_buckets', to='api.campaign'),
+        ),
+        migrations.AddIndex(
+            model_name='campaigndonationbucket',
+            index=models.Index(fields=['hour'], name='donationbucket_hour_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='campaigndonationbucket',
+            unique_together={('campaign', 'hour')},
+        ),
+        migrations.RunPython(migrations.RunPython.noop, drop_ngo_name_trigger),
+        migrations.RunPython(populate_trending, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:42
+
+import math
+from datetime import datetime, timezone
+
+from django.db import migrations, models
+
+# SQLite rebuilds api_issue to add the column, which drops its FTS triggers;
+# the post_migrate receiver api.search.ensure_installed puts them back.
+
+# Same formula and constants as api/hot.py at the time of writing
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+DECAY_SECONDS = 45000
+COMMENT_WEIGHT = 2
+PRIORITY_BOOST = {'Critical': 1.0, 'High': 0.5, 'Medium': 0.2}
+CLOSED_STATUSES = ('Resolved', 'Rejected')
+CLOSED_PENALTY = 2.0
+
+
+def hot_score(upvotes, comment_count, priority, status, created_at):
+    activity = 1 + max(upvotes, 0) + COMMENT_WEIGHT * max(comment_count, 0)
+    boost = PRIORITY_BOOST.get(priority, 0.0)
+    if status == 'Critical':
+        boost = max(boost, PRIORITY_BOOST['Critical'])
+    elif status in CLOSED_STATUSES:
+        boost -= CLOSED_PENALTY
+    return math.log10(activity) + boost + (created_at - EPOCH).total_seconds() / DECAY_SECONDS
+
+
+def populate_hot_scores(apps, schema_editor):
+    Issue = apps.get_model('api', 'Issue')
+    fields = ('upvotes', 'comment_count', 'priority', 'status', 'created_at')
+    batch = []
+    for pk, *values in Issue.objects.values_list('pk', *fields).iterator(chunk_size=2000):
+        batch.append(Issue(pk=pk, hot_score=hot_score(*values)))
+        if len(batch) == 2000:
+            Issue.objects.bulk_update(batch, ['hot_score'])
+            batch = []
+    Issue.objects.bulk_update(batch, ['hot_score'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_campaign_trending'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='hot_score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['hot_score', 'id'], name='issue_hot_score_id_idx'),
+        ),
+        migrations.RunPython(populate_hot_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_issue_hot_score'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(condition=models.Q(('is_verified', True)), fields=['created_at'], name='campaign_verified_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['campaign', 'created_at'], name='donation_campaign_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['donor', 'created_at'], name='donation_donor_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['created_at'], name='donation_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='issue_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['author', 'created_at', 'id'], name='issue_author_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['category', 'status'], name='issue_category_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transparencyreport',
+            index=models.Index(fields=['created_at'], name='report_created_idx'),
+        ),
+    ]
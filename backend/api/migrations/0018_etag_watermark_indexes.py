@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-17 02:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(fields=['updated_at'], name='campaign_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['updated_at'], name='issue_updated_idx'),
+        ),
+    ]
@@ -1,9 +1,15 @@
-from django.db import models
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models, transaction, IntegrityError
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator
+from django.db.models import F
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from .validators import validate_name_length, validate_phone_number, validate_cnic
+from . import cache, geo, hot
 
 class User(AbstractUser):
     """Custom User model with additional fields"""
@@ -72,8 +78,14 @@ class Issue(models.Model):
     image = models.ImageField(upload_to='issues/', blank=True, null=True)
     image_url = models.URLField(blank=True, null=True)
     upvotes = models.IntegerField(default=0)
+    # Maintained by the Comment signals so lists never COUNT per row
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    # Feed ranking from api/hot.py, refreshed whenever its inputs change
+    hot_score = models.FloatField(default=0, editable=False)
     latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
+    # Derived from latitude/longitude in save(); indexed for map lookups
+    geohash = models.CharField(max_length=12, blank=True, null=True, editable=False, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     resolved_at = models.DateTimeField(blank=True, null=True)
@@ -81,32 +93,186 @@ class Issue(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination for the -created_at / -upvotes feeds
+            models.Index(fields=['created_at', 'id'], name='issue_created_at_id_idx'),
+            models.Index(fields=['upvotes', 'id'], name='issue_upvotes_id_idx'),
+            models.Index(fields=['hot_score', 'id'], name='issue_hot_score_id_idx'),
+            # Filtered feeds: ?status=, ?my_reports=, ?category=&status=
+            models.Index(fields=['status', 'created_at', 'id'], name='issue_status_created_idx'),
+            models.Index(fields=['author', 'created_at', 'id'], name='issue_author_created_idx'),
+            models.Index(fields=['category', 'status'], name='issue_category_status_idx'),
+            # List ETags with a per-process cache (see conditional.py)
+            models.Index(fields=['updated_at'], name='issue_updated_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what was loaded so save() can diff in memory
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        # The reloaded columns match the database again
+        if fields is None:
+            attnames = [f.attname for f in self._meta.concrete_fields if f.attname in self.__dict__]
+        else:
+            attnames = [
+                field.attname for field in map(self._meta.get_field, fields)
+                if field.concrete and field.attname in self.__dict__
+            ]
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            if fields is not None:
+                return  # a partial snapshot would hide changes to the other fields
+            loaded = self._loaded_values = {}
+        loaded.update((attname, self.__dict__[attname]) for attname in attnames)
+
+    def get_dirty_fields(self):
+        """Return attnames of concrete fields changed since the row was loaded"""
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return None
+        dirty = []
+        for field in self._meta.concrete_fields:
+            attname = field.attname
+            if attname not in self.__dict__:
+                continue  # still deferred, cannot have changed
+            if attname not in loaded or loaded[attname] != self.__dict__[attname]:
+                dirty.append(attname)
+        return dirty
+
+    TRACKED_FIELDS = ('status', 'category', 'geohash', 'latitude', 'longitude')
 
     def save(self, *args, **kwargs):
+        self.geohash = self.compute_geohash()
+        dirty = None
+        old_status = None
+        # Pre-save values of the fields signal handlers care about (None for new rows)
+        self._original = None
         # Handle existing issues (Updates)
         if self.pk:
-            try:
-                old_instance = Issue.objects.get(pk=self.pk)
-                
-                # Check if status has changed
-                if old_instance.status != self.status:
-                    # 1. Automatically create Timeline Entry
+            dirty = self.get_dirty_fields()
+            if dirty is not None:
+                self._original = {
+                    name: self._loaded_values[name] if name in self._loaded_values else getattr(self, name)
+                    for name in self.TRACKED_FIELDS
+                }
+            else:
+                # Not loaded through the ORM (e.g. built by hand with a pk)
+                self._original = Issue.objects.filter(pk=self.pk).values(*self.TRACKED_FIELDS).first()
+            if self._original is not None:
+                old_status = self._original['status']
+
+        status_changed = old_status is not None and old_status != self.status
+        if status_changed:
+            # Automatically manage 'resolved_at' timestamp
+            if self.status == 'Resolved' and not self.resolved_at:
+                self.resolved_at = timezone.now()
+            elif self.status != 'Resolved':
+                self.resolved_at = None
+            if dirty is not None and 'resolved_at' not in dirty:
+                dirty.append('resolved_at')
+
+        hot_inputs_changed = dirty is None or not set(dirty).isdisjoint(hot.FIELDS)
+        if hot_inputs_changed:
+            hot_score = self.compute_hot_score()
+            if hot_score != self.hot_score:
+                self.hot_score = hot_score
+                if dirty is not None:
+                    dirty.append('hot_score')
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            if status_changed and 'status' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'resolved_at'}
+            if not set(update_fields).isdisjoint(hot.FIELDS):
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'hot_score'}
+        elif dirty is not None and not args:
+            # Write only the changed columns (plus auto_now timestamps); a bare
+            # save() with nothing changed is skipped, signals included
+            if not dirty and not kwargs:
+                return
+            kwargs['update_fields'] = {*dirty, 'updated_at'}
+
+        # Creates and changes to tracked fields fan out to the status counters
+        # and map clusters in post_save, which must commit with the row itself.
+        tracked_changed = self._original is None or any(
+            self._original[name] != getattr(self, name) for name in self.TRACKED_FIELDS
+        )
+        if tracked_changed:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+                if status_changed:
+                    # Automatically create Timeline Entry
                     IssueTimeline.objects.create(
                         issue=self,
                         status=self.status,
-                        description=f"Status updated from {old_instance.status} to {self.status}."
+                        description=f"Status updated from {old_status} to {self.status}."
                     )
+        else:
+            super().save(*args, **kwargs)
 
-                    # 2. Automatically manage 'resolved_at' timestamp
-                    if self.status == 'Resolved' and not self.resolved_at:
-                        self.resolved_at = timezone.now()
-                    elif self.status != 'Resolved':
-                        self.resolved_at = None
-                        
-            except Issue.DoesNotExist:
-                pass
-        
-        super().save(*args, **kwargs)
+        self._loaded_values = {
+            f.attname: self.__dict__[f.attname]
+            for f in self._meta.concrete_fields if f.attname in self.__dict__
+        }
+
+    def compute_hot_score(self):
+        created_at = self.created_at or timezone.now()  # set by auto_now_add on insert
+        return hot.score(self.upvotes, self.comment_count, self.priority, self.status, created_at)
+
+    @classmethod
+    def refresh_hot_scores(cls, pks):
+        """Recompute hot_score of the given issues from their stored counters"""
+        issues = [
+            cls(pk=pk, hot_score=hot.score(*values))
+            for pk, *values in cls.objects.filter(pk__in=pks).values_list('pk', *hot.FIELDS)
+        ]
+        cls.objects.bulk_update(issues, ['hot_score'], batch_size=500)
+
+    def compute_geohash(self):
+        if self.latitude is None or self.longitude is None:
+            return None
+        return geo.encode(self.latitude, self.longitude)
+
+    def add_upvote(self, user):
+        """Record an upvote from `user`; returns (created, upvotes)"""
+        # Insert first and let the unique constraint reject duplicates,
+        # so the write lock is taken once and only the counter (and updated_at,
+        # which feeds the ETag validators) is written.
+        try:
+            with transaction.atomic():
+                IssueUpvote.objects.create(user=user, issue=self)
+                Issue.objects.filter(pk=self.pk).update(upvotes=F('upvotes') + 1, updated_at=timezone.now())
+                Issue.refresh_hot_scores([self.pk])
+            created = True
+        except IntegrityError:
+            created = False
+        if created:
+            # F() updates skip post_save, so invalidate cached responses here
+            cache.bump('issues')
+        self._reload_counters()
+        return created, self.upvotes
+
+    def remove_upvote(self, user):
+        """Counterpart of add_upvote; returns (removed, upvotes)"""
+        with transaction.atomic():
+            removed, _ = IssueUpvote.objects.filter(user=user, issue=self).delete()
+            if removed:
+                Issue.objects.filter(pk=self.pk, upvotes__gt=0).update(upvotes=F('upvotes') - 1, updated_at=timezone.now())
+                Issue.refresh_hot_scores([self.pk])
+        if removed:
+            cache.bump('issues')
+        self._reload_counters()
+        return bool(removed), self.upvotes
+
+    def _reload_counters(self):
+        # The F() updates above bypass save(), so reload what they wrote and
+        # keep the snapshot in step: a later save() must not write them back
+        self.refresh_from_db(fields=['upvotes', 'hot_score', 'updated_at'])
 
     def __str__(self):
         return self.title
@@ -125,6 +291,103 @@ class IssueUpvote(models.Model):
         return f"{self.user.email} upvoted {self.issue.title}"
 
 
+class PendingUpvote(models.Model):
+    """Append-only buffer of upvote changes, applied in batches by flush_upvotes"""
+    UPVOTE = 1
+    REMOVE = -1
+    DELTA_CHOICES = [
+        (UPVOTE, 'Upvote'),
+        (REMOVE, 'Remove upvote'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name='pending_upvotes')
+    delta = models.SmallIntegerField(choices=DELTA_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.user_id} {self.get_delta_display()} on {self.issue_id}"
+
+    @classmethod
+    def enqueue(cls, issue, user, delta):
+        """Buffer a vote change; flushes inline if the buffer lags too far behind"""
+        cls.objects.create(issue=issue, user=user, delta=delta)
+        # A safety net for a stalled flusher, not a replacement for one: it only
+        # runs when another vote arrives, so the last votes of a burst stay
+        # buffered until `flush_upvotes` picks them up.
+        oldest = cls.objects.values_list('created_at', flat=True).first()
+        max_lag = timedelta(seconds=settings.UPVOTE_FLUSH_MAX_LAG)
+        if oldest is not None and timezone.now() - oldest > max_lag:
+            cls.flush()
+
+    @classmethod
+    def projected_upvotes(cls, issue_id):
+        """The issue's upvote count once its buffered changes are flushed"""
+        # One read transaction, so the count and the buffer come from the same snapshot
+        with transaction.atomic():
+            upvotes = Issue.objects.filter(pk=issue_id).values_list('upvotes', flat=True).get()
+            # Ordered by id, so the last change per user wins as in flush()
+            final = dict(cls.objects.filter(issue_id=issue_id).values_list('user_id', 'delta'))
+            if final:
+                existing = set(IssueUpvote.objects.filter(
+                    issue_id=issue_id, user_id__in=final,
+                ).values_list('user_id', flat=True))
+                for user_id, delta in final.items():
+                    if delta > 0 and user_id not in existing:
+                        upvotes += 1
+                    elif delta < 0 and user_id in existing:
+                        upvotes -= 1
+        return max(upvotes, 0)
+
+    @classmethod
+    def flush(cls, batch_size=None):
+        """Apply up to `batch_size` buffered changes; returns how many were consumed"""
+        batch_size = batch_size or settings.UPVOTE_FLUSH_BATCH_SIZE
+        # Applying the batch and deleting it share one transaction, so a crash
+        # either leaves the buffer untouched or fully applied.
+        with transaction.atomic():
+            rows = list(cls.objects.values_list('id', 'user_id', 'issue_id', 'delta')[:batch_size])
+            if not rows:
+                return 0
+
+            # Collapse repeated clicks: the last change per (user, issue) wins
+            final = {}
+            for _, user_id, issue_id, delta in rows:
+                final[(user_id, issue_id)] = delta
+
+            existing = set(IssueUpvote.objects.filter(
+                user_id__in={user_id for user_id, _ in final},
+                issue_id__in={issue_id for _, issue_id in final},
+            ).values_list('user_id', 'issue_id'))
+
+            deltas = Counter()
+            to_add = []
+            to_remove = defaultdict(list)
+            for (user_id, issue_id), delta in final.items():
+                if delta > 0 and (user_id, issue_id) not in existing:
+                    to_add.append(IssueUpvote(user_id=user_id, issue_id=issue_id))
+                    deltas[issue_id] += 1
+                elif delta < 0 and (user_id, issue_id) in existing:
+                    to_remove[issue_id].append(user_id)
+                    deltas[issue_id] -= 1
+
+            now = timezone.now()
+            IssueUpvote.objects.bulk_create(to_add)
+            for issue_id, user_ids in to_remove.items():
+                IssueUpvote.objects.filter(issue_id=issue_id, user_id__in=user_ids).delete()
+            for issue_id, delta in deltas.items():
+                if delta:
+                    Issue.objects.filter(pk=issue_id).update(upvotes=F('upvotes') + delta, updated_at=now)
+            Issue.refresh_hot_scores([issue_id for issue_id, delta in deltas.items() if delta])
+
+            cls.objects.filter(id__in=[row[0] for row in rows]).delete()
+        cache.bump('issues')
+        return len(rows)
+
+
 class Comment(models.Model):
     """Comments on issues"""
     issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name='comments')
@@ -135,6 +398,10 @@ class Comment(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pages of one issue's thread
+            models.Index(fields=['issue', 'created_at', 'id'], name='comment_issue_created_id_idx'),
+        ]
     
     def __str__(self):
         return f"Comment by {self.user.email} on {self.issue.title}"
@@ -150,11 +417,93 @@ class IssueTimeline(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Latest-K prefetch for lists and keyset pages of one issue's history
+            models.Index(fields=['issue', 'created_at', 'id'], name='timeline_issue_created_id_idx'),
+        ]
     
     def __str__(self):
         return f"{self.issue.title} - {self.status}"
 
 
+class IssueStatusCount(models.Model):
+    """
+    Running issue counts per (status, category), kept in step by signals.
+
+    Serves the stats and dashboard endpoints without COUNT queries over the
+    issue table. `reconcile_issue_counts` checks them against the source.
+    """
+    status = models.CharField(max_length=20)
+    category = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ['status', 'category']
+
+    def __str__(self):
+        return f"{self.status}/{self.category}: {self.count}"
+
+    @classmethod
+    def apply(cls, status, category, delta):
+        cls.objects.bulk_create([cls(status=status, category=category)], ignore_conflicts=True)
+        cls.objects.filter(status=status, category=category).update(count=F('count') + delta)
+
+    @classmethod
+    def by_status(cls):
+        """Return {status: count} summed over categories"""
+        totals = Counter()
+        for issue_status, count in cls.objects.values_list('status', 'count'):
+            totals[issue_status] += count
+        return totals
+
+
+class MapCluster(models.Model):
+    """
+    Pre-aggregated map markers: issue counts per geohash cell, category and status.
+
+    Each located issue contributes to one row per precision in
+    CLUSTER_PRECISIONS, keyed by the matching prefix of its geohash.
+    Signals apply +1/-1 deltas as issues are created, moved, recategorised,
+    resolved or deleted; `rebuild_clusters` recomputes the table from scratch.
+    """
+    CLUSTER_PRECISIONS = range(1, 8)
+
+    precision = models.PositiveSmallIntegerField()
+    cell = models.CharField(max_length=12)
+    category = models.CharField(max_length=50)
+    status = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+    latitude_sum = models.FloatField(default=0)
+    longitude_sum = models.FloatField(default=0)
+
+    class Meta:
+        unique_together = ['cell', 'category', 'status']
+        indexes = [
+            models.Index(fields=['precision', 'cell'], name='mapcluster_precision_cell_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.cell} {self.category}/{self.status}: {self.count}"
+
+    @classmethod
+    def apply(cls, geohash, category, status, latitude, longitude, sign):
+        """Add (sign=1) or remove (sign=-1) one issue from every enclosing cell"""
+        if not geohash or latitude is None or longitude is None:
+            return
+        cells = [geohash[:precision] for precision in cls.CLUSTER_PRECISIONS]
+        with transaction.atomic():
+            cls.objects.bulk_create(
+                [cls(precision=len(cell), cell=cell, category=category, status=status) for cell in cells],
+                ignore_conflicts=True,
+            )
+            # Every enclosing cell gets the same delta, so one UPDATE covers them all
+            cls.objects.filter(cell__in=cells, category=category, status=status).update(
+                count=F('count') + sign,
+                latitude_sum=F('latitude_sum') + sign * float(latitude),
+                longitude_sum=F('longitude_sum') + sign * float(longitude),
+            )
+
+
 class Campaign(models.Model):
     """Donation campaign model"""
     CATEGORY_CHOICES = [
@@ -176,6 +525,8 @@ class Campaign(models.Model):
     goal_amount = models.DecimalField(max_digits=12, decimal_places=2, validators=[MinValueValidator(0)])
     raised_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0, validators=[MinValueValidator(0)])
     donor_count = models.IntegerField(default=0)
+    # Donation velocity over sliding windows, maintained by api/trending.py
+    trending_score = models.FloatField(default=0, editable=False)
     is_verified = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -183,10 +534,29 @@ class Campaign(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['trending_score', 'id'], name='campaign_trending_idx'),
+            # Public list: verified campaigns, newest first. Partial, because Django
+            # renders is_verified=True as a bare `WHERE is_verified` that SQLite
+            # cannot match against a leading boolean column.
+            models.Index(fields=['created_at'], condition=models.Q(is_verified=True),
+                         name='campaign_verified_created_idx'),
+            # List ETags with a per-process cache (see conditional.py)
+            models.Index(fields=['updated_at'], name='campaign_updated_idx'),
+        ]
     
     def __str__(self):
         return self.title
     
+    @classmethod
+    def apply_donation(cls, campaign_id, amount, donors):
+        """Add `amount` and `donors` (negative to remove) to a campaign's totals"""
+        cls.objects.filter(pk=campaign_id).update(
+            raised_amount=F('raised_amount') + amount,
+            donor_count=F('donor_count') + donors,
+            updated_at=timezone.now(),
+        )
+    
     @property
     def progress_percentage(self):
         if self.goal_amount == 0:
@@ -215,14 +585,80 @@ class Donation(models.Model):
     amount = models.DecimalField(max_digits=12, decimal_places=2, validators=[MinValueValidator(0)])
     is_anonymous = models.BooleanField(default=False)
     payment_method = models.CharField(max_length=50, blank=True)
-    transaction_id = models.CharField(max_length=255, blank=True, null=True)
+    # Indexed for de-duplicating settlement files (see settlements.py)
+    transaction_id = models.CharField(max_length=255, blank=True, null=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    TRACKED_FIELDS = ('campaign_id', 'donor_id', 'amount')
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Distinct-donor checks when campaign totals are updated
+            models.Index(fields=['campaign', 'donor'], name='donation_campaign_donor_idx'),
+            # Newest-first lists: per campaign, per donor, and all (staff)
+            models.Index(fields=['campaign', 'created_at'], name='donation_campaign_created_idx'),
+            models.Index(fields=['donor', 'created_at'], name='donation_donor_created_idx'),
+            models.Index(fields=['created_at'], name='donation_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.donor.email} donated {self.amount} to {self.campaign.title}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if name in cls.TRACKED_FIELDS
+        }
+        return instance
+    
+    def save(self, *args, **kwargs):
+        # The post_save signal moves the campaign totals; commit both together
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self._loaded_values = {name: getattr(self, name) for name in self.TRACKED_FIELDS}
+    
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
+    
+    @classmethod
+    def has_other_donations(cls, campaign_id, donor_id, exclude_pk):
+        """Whether the donor gave to the campaign apart from donation `exclude_pk`"""
+        return cls.objects.filter(campaign_id=campaign_id, donor_id=donor_id).exclude(pk=exclude_pk).exists()
+
+
+class CampaignDonationBucket(models.Model):
+    """
+    Donations to a campaign per clock hour, for the trending windows.
+
+    Donation signals and settlement imports add to the bucket of the hour
+    a donation was made in; `refresh_trending` drops buckets that have
+    aged out of the longest window.
+    """
+    campaign = models.ForeignKey(Campaign, on_delete=models.CASCADE, related_name='donation_buckets')
+    hour = models.DateTimeField()
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    donations = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ['campaign', 'hour']
+        indexes = [
+            models.Index(fields=['hour'], name='donationbucket_hour_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.campaign_id} @ {self.hour:%Y-%m-%d %H}:00: {self.amount} from {self.donations}"
+
+    @classmethod
+    def apply(cls, campaign_id, hour, amount, donations):
+        """Add `amount` and `donations` (negative to remove) to one hourly bucket"""
+        with transaction.atomic():
+            cls.objects.bulk_create([cls(campaign_id=campaign_id, hour=hour)], ignore_conflicts=True)
+            cls.objects.filter(campaign_id=campaign_id, hour=hour).update(
+                amount=F('amount') + amount, donations=F('donations') + donations,
+            )
 
 
 class TransparencyReport(models.Model):
@@ -237,6 +673,9 @@ class TransparencyReport(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='report_created_idx'),
+        ]
     
     def __str__(self):
         return self.title
\ No newline at end of file
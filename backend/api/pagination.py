@@ -0,0 +1,186 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPaginationMixin:
+    """
+    Cursor pagination keyed on (field, id).
+
+    Each page is fetched with a "WHERE (field, id) < (last_field, last_id)"
+    range predicate instead of an OFFSET, so page N+1 costs the same as page 1
+    and rows inserted while a client is paging never shift the window. Only
+    orderings listed in `keyset_fields` are supported; the matching composite
+    indexes live on the model's Meta.
+    """
+    cursor_query_param = 'cursor'
+    keyset_fields = ()
+
+    def get_keyset_field(self, queryset):
+        """Return (field, descending) for the queryset ordering, or None"""
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        if not ordering:
+            return None
+        first = ordering[0]
+        if not isinstance(first, str):
+            return None
+        field = first.lstrip('-')
+        if field not in self.keyset_fields:
+            return None
+        return field, first.startswith('-')
+
+    def encode_cursor(self, value, pk, reverse=False):
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        payload = {'v': value, 'id': pk}
+        if reverse:
+            payload['r'] = 1
+        raw = json.dumps(payload, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, cursor, field, model):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            payload = json.loads(raw)
+            value, pk = payload['v'], int(payload['id'])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound('Invalid cursor.')
+        # E.g. a created_at cursor reused after switching to ?ordering=-upvotes
+        try:
+            if field.endswith('_at'):
+                value = parse_datetime(value) if isinstance(value, str) else None
+            else:
+                value = model._meta.get_field(field).to_python(value)
+        except (ValidationError, ValueError):
+            value = None
+        if value is None:
+            raise NotFound('Invalid cursor.')
+        return value, pk, bool(payload.get('r'))
+
+    def paginate_keyset(self, queryset, request, field, descending):
+        self.page_size = self.get_page_size(request)
+        self.keyset_field = field
+        self.descending = descending
+        self.request = request
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        reverse = False
+        if cursor:
+            value, pk, reverse = self.decode_cursor(cursor, field, queryset.model)
+            # Walking backwards flips the comparison and the sort order.
+            before = descending != reverse
+            lookup = 'lt' if before else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{field}__{lookup}': value}) |
+                Q(**{field: value, f'id__{lookup}': pk})
+            )
+        else:
+            before = descending
+
+        prefix = '-' if before else ''
+        queryset = queryset.order_by(f'{prefix}{field}', f'{prefix}id')
+
+        # Fetch one extra row to know whether another page exists.
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = has_more if not reverse else bool(cursor)
+        self.has_previous = bool(cursor) if not reverse else has_more
+        self.page_rows = rows
+        return rows
+
+    def get_keyset_link(self, row, reverse):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, 'page')
+        cursor = self.encode_cursor(getattr(row, self.keyset_field), row.pk, reverse)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_keyset_response(self, data):
+        next_link = previous_link = None
+        if self.page_rows:
+            if self.has_next:
+                next_link = self.get_keyset_link(self.page_rows[-1], reverse=False)
+            if self.has_previous:
+                previous_link = self.get_keyset_link(self.page_rows[0], reverse=True)
+        return Response(OrderedDict([
+            ('next', next_link),
+            ('previous', previous_link),
+            ('results', data),
+        ]))
+
+
+class IssuePagination(KeysetPaginationMixin, PageNumberPagination):
+    """
+    Page-number pagination for the issue feed with an opt-in cursor mode.
+
+    Existing clients keep using `?page=`. Clients that send `?pagination=cursor`
+    (or follow a `cursor` link) on the `-created_at` / `-upvotes` feeds get
+    keyset pages without the COUNT(*) and OFFSET scan. The `hot` ordering
+    (`-hot_score`) pages the same way.
+    """
+    mode_query_param = 'pagination'
+    keyset_fields = ('created_at', 'upvotes', 'hot_score')
+
+    def wants_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.use_keyset = False
+        if self.wants_cursor(request):
+            keyset = self.get_keyset_field(queryset)
+            if keyset is None:
+                # E.g. relevance-ranked ?search= results; never fall back silently
+                raise ValidationError({self.mode_query_param: [
+                    'Cursor pagination needs ?ordering= created_at, upvotes or hot; '
+                    'relevance-ranked search results are paged with ?page=.'
+                ]})
+            self.use_keyset = True
+            return self.paginate_keyset(queryset, request, *keyset)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.use_keyset:
+            return self.get_keyset_response(data)
+        return super().get_paginated_response(data)
+
+
+class CommentPagination(KeysetPaginationMixin, PageNumberPagination):
+    """
+    Cursor-only pagination for an issue's comment thread.
+
+    Threads can grow to thousands of comments, so there is no page-number
+    mode: every page is a keyset range over (created_at, id).
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    keyset_fields = ('created_at',)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        keyset = self.get_keyset_field(queryset) or ('created_at', True)
+        return self.paginate_keyset(queryset, request, *keyset)
+
+    def get_paginated_response(self, data):
+        return self.get_keyset_response(data)
+
+
+class TimelinePagination(CommentPagination):
+    """Cursor-only pagination for an issue's full status history"""
+
+
+class DonationPagination(CommentPagination):
+    """Cursor-only pagination for a campaign's donations, newest first"""
@@ -0,0 +1,114 @@
+"""
+Read replicas.
+
+ReplicaRouter sends every write to `default`. Reads go to `default` as
+well, except inside `use_replica()`, which views opt into with
+ReplicaReadMixin for their safe, lag-tolerant actions (`replica_actions`).
+
+Replicas lag behind the primary, so a user who has just written is pinned
+to the primary for REPLICA_PIN_SECONDS: ReplicaPinMiddleware marks the
+user after every successful unsafe request, and the mixin skips the
+replica while the mark lasts. The marks live in the default cache, so
+pinning is shared between workers only with a shared cache backend.
+
+With no DATABASE_REPLICAS configured, everything stays on `default`.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+
+PIN_KEY = 'replica-pin:{}'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_read_alias = ContextVar('replica_read_alias', default=None)
+
+
+def replica_aliases():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def pin(user):
+    """Keep `user`'s reads on the primary for REPLICA_PIN_SECONDS"""
+    cache.set(PIN_KEY.format(user.pk), True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user):
+    return user.is_authenticated and cache.get(PIN_KEY.format(user.pk)) is not None
+
+
+@contextmanager
+def use_replica(alias=None):
+    """Route reads in the block to `alias` (default: a random replica)"""
+    aliases = replica_aliases()
+    if alias is None and aliases:
+        alias = random.choice(aliases)
+    token = _read_alias.set(alias)
+    try:
+        yield alias
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get() or 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema with the data, from sync_replica
+        return db not in replica_aliases()
+
+
+class ReplicaReadMixin:
+    """Serve `replica_actions` from a replica unless the user has just written"""
+    # Viewset actions to serve from a replica; None means every safe request (APIView)
+    replica_actions = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # After authentication, so pinning can look at the user
+        if self.reads_from_replica(request):
+            self._replica_context = use_replica()
+            self._replica_context.__enter__()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        context = getattr(self, '_replica_context', None)
+        if context is not None:
+            self._replica_context = None
+            context.__exit__(None, None, None)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def reads_from_replica(self, request):
+        if not replica_aliases() or request.method not in SAFE_METHODS:
+            return False
+        action = getattr(self, 'action', None)
+        if self.replica_actions is not None and action not in self.replica_actions:
+            return False
+        return not is_pinned(request.user)
+
+
+class ReplicaPinMiddleware:
+    """Pin users to the primary after requests that wrote"""
+
+    def __init__(self, get_response):
+        if not replica_aliases():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        # DRF copies the token-authenticated user onto the Django request
+        user = getattr(request, 'user', None)
+        if request.method not in SAFE_METHODS and response.status_code < 400 and user and user.is_authenticated:
+            pin(user)
+        return response
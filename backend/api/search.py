@@ -0,0 +1,160 @@
+"""
+SQLite FTS5 indexes behind the `?search=` parameter.
+
+`api_issue_fts` is an external-content index over api_issue, so the text is
+not stored twice. `api_campaign_fts` stores its own copy because it also
+indexes the NGO's organisation name from api_user. Triggers keep both
+indexes in step with every INSERT, UPDATE and DELETE, including bulk ORM
+operations that skip model signals.
+
+SQLite drops a table's triggers when a migration rebuilds it (e.g. AddField
+on api_issue), so `ensure_installed` runs after every `migrate` and puts
+back whatever is missing; migrations do not need to restore them by hand.
+"""
+import re
+
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+
+ISSUE_FTS = 'api_issue_fts'
+CAMPAIGN_FTS = 'api_campaign_fts'
+
+# Column weights for bm25(), in index column order
+ISSUE_WEIGHTS = (10.0, 1.0, 4.0)      # title, description, location
+CAMPAIGN_WEIGHTS = (10.0, 1.0, 4.0)   # title, description, ngo_name
+
+INSTALL_SQL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {ISSUE_FTS} USING fts5(
+        title, description, location,
+        content='api_issue', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS api_issue_fts_ai AFTER INSERT ON api_issue BEGIN
+        INSERT INTO {ISSUE_FTS}(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS api_issue_fts_ad AFTER DELETE ON api_issue BEGIN
+        INSERT INTO {ISSUE_FTS}({ISSUE_FTS}, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS api_issue_fts_au
+        AFTER UPDATE OF title, description, location ON api_issue BEGIN
+        INSERT INTO {ISSUE_FTS}({ISSUE_FTS}, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+        INSERT INTO {ISSUE_FTS}(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {CAMPAIGN_FTS} USING fts5(
+        title, description, ngo_name,
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS api_campaign_fts_ai AFTER INSERT ON api_campaign BEGIN
+        INSERT INTO {CAMPAIGN_FTS}(rowid, title, description, ngo_name)
+        VALUES (new.id, new.title, new.description,
+                (SELECT organization_name FROM api_user WHERE id = new.ngo_id));
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS api_campaign_fts_ad AFTER DELETE ON api_campaign BEGIN
+        DELETE FROM {CAMPAIGN_FTS} WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS api_campaign_fts_au
+        AFTER UPDATE OF title, description, ngo_id ON api_campaign BEGIN
+        UPDATE {CAMPAIGN_FTS}
+        SET title = new.title, description = new.description,
+            ngo_name = (SELECT organization_name FROM api_user WHERE id = new.ngo_id)
+        WHERE rowid = new.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS api_campaign_fts_ngo_au
+        AFTER UPDATE OF organization_name ON api_user BEGIN
+        UPDATE {CAMPAIGN_FTS} SET ngo_name = new.organization_name
+        WHERE rowid IN (SELECT id FROM api_campaign WHERE ngo_id = new.id);
+    END""",
+]
+
+UNINSTALL_SQL = [
+    'DROP TRIGGER IF EXISTS api_campaign_fts_ngo_au',
+    'DROP TRIGGER IF EXISTS api_campaign_fts_au',
+    'DROP TRIGGER IF EXISTS api_campaign_fts_ad',
+    'DROP TRIGGER IF EXISTS api_campaign_fts_ai',
+    f'DROP TABLE IF EXISTS {CAMPAIGN_FTS}',
+    'DROP TRIGGER IF EXISTS api_issue_fts_au',
+    'DROP TRIGGER IF EXISTS api_issue_fts_ad',
+    'DROP TRIGGER IF EXISTS api_issue_fts_ai',
+    f'DROP TABLE IF EXISTS {ISSUE_FTS}',
+]
+
+REBUILD_SQL = [
+    f"INSERT INTO {ISSUE_FTS}({ISSUE_FTS}) VALUES ('rebuild')",
+    f'DELETE FROM {CAMPAIGN_FTS}',
+    f"""INSERT INTO {CAMPAIGN_FTS}(rowid, title, description, ngo_name)
+        SELECT c.id, c.title, c.description, u.organization_name
+        FROM api_campaign c LEFT JOIN api_user u ON u.id = c.ngo_id""",
+    f"INSERT INTO {ISSUE_FTS}({ISSUE_FTS}) VALUES ('optimize')",
+    f"INSERT INTO {CAMPAIGN_FTS}({CAMPAIGN_FTS}) VALUES ('optimize')",
+]
+
+
+OBJECTS = [
+    ISSUE_FTS, 'api_issue_fts_ai', 'api_issue_fts_ad', 'api_issue_fts_au',
+    CAMPAIGN_FTS, 'api_campaign_fts_ai', 'api_campaign_fts_ad', 'api_campaign_fts_au', 'api_campaign_fts_ngo_au',
+]
+# The indexes exist from this migration on
+INSTALLED_BY = ('api', '0009_fulltext_search')
+
+
+def is_supported(connection):
+    return connection.vendor == 'sqlite'
+
+
+def missing_objects(connection):
+    """Names in OBJECTS that the database does not have"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT name FROM sqlite_master WHERE name IN ({', '.join(['%s'] * len(OBJECTS))})", OBJECTS
+        )
+        present = {name for name, in cursor.fetchall()}
+    return [name for name in OBJECTS if name not in present]
+
+
+def ensure_installed(sender, using, **kwargs):
+    """post_migrate receiver: reinstall FTS tables and triggers a migration dropped"""
+    connection = connections[using]
+    if not is_supported(connection) or INSTALLED_BY not in MigrationRecorder(connection).applied_migrations():
+        return
+    if missing_objects(connection):
+        # Writes made while a trigger was missing never reached the index
+        install(connection)
+        rebuild(connection)
+
+
+def install(connection):
+    with connection.cursor() as cursor:
+        for statement in INSTALL_SQL:
+            cursor.execute(statement)
+
+
+def uninstall(connection):
+    with connection.cursor() as cursor:
+        for statement in UNINSTALL_SQL:
+            cursor.execute(statement)
+
+
+def rebuild(connection):
+    with connection.cursor() as cursor:
+        for statement in REBUILD_SQL:
+            cursor.execute(statement)
+
+
+def build_match(terms):
+    """
+    Turn search terms into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix query ("lahor"* matches "Lahore"), and
+    the words are ANDed together. Quoting stops FTS5 operators in user input
+    from being interpreted. Returns None when nothing searchable remains.
+    """
+    words = []
+    for term in terms:
+        words.extend(re.findall(r'\w+', term))
+    if not words:
+        return None
+    return ' '.join(f'"{word}"*' for word in words)
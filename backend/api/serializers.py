@@ -103,6 +103,40 @@ class IssueTimelineSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
+class SparseFieldsetMixin:
+    """
+    Let clients choose the serialized fields with `?fields=a,b` and add
+    optional ones with `?expand=x,y`.
+
+    `default_fields` is the representation returned when neither parameter is
+    given (None means every declared field); `expandable_fields` are only
+    rendered on request. Views use `requested_fields()` to skip the
+    prefetches and joins behind fields that will not be rendered.
+    """
+    default_fields = None
+    expandable_fields = ()
+
+    @classmethod
+    def requested_fields(cls, request):
+        all_fields = list(cls.Meta.fields)
+        if request is None:
+            selected = list(cls.default_fields or all_fields)
+        else:
+            params = request.query_params
+            fields = [f.strip() for f in params.get('fields', '').split(',') if f.strip()]
+            expand = [f.strip() for f in params.get('expand', '').split(',') if f.strip()]
+            selected = fields or list(cls.default_fields or all_fields)
+            selected += [f for f in expand if f in cls.expandable_fields]
+        return {f for f in selected if f in all_fields} | {'id'}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        keep = self.requested_fields(self.context.get('request'))
+        for name in list(self.fields):
+            if name not in keep:
+                self.fields.pop(name)
+
+
 class IssueSerializer(serializers.ModelSerializer):
     author_email = serializers.EmailField(source='author.email', read_only=True)
     author_name = serializers.SerializerMethodField()
@@ -117,10 +151,10 @@ class IssueSerializer(serializers.ModelSerializer):
         # DRF will now automatically use 'location' from your model correctly.
         fields = ['id', 'title', 'description', 'location', 'category', 'status', 
                   'priority', 'author', 'author_email', 'author_name', 'image', 
-                  'image_url', 'image_url_full', 'upvotes', 'latitude', 'longitude',
+                  'image_url', 'image_url_full', 'upvotes', 'comment_count', 'latitude', 'longitude',
                   'created_at', 'updated_at', 'resolved_at', 'resolved_by', 
                   'timeline', 'time_text', 'user_has_upvoted']
-        read_only_fields = ['id', 'created_at', 'updated_at', 'upvotes']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'upvotes', 'comment_count']
     
     def get_author_name(self, obj):
         return f"{obj.author.first_name} {obj.author.last_name}".strip() or obj.author.username
@@ -148,6 +182,10 @@ class IssueSerializer(serializers.ModelSerializer):
     
     def get_user_has_upvoted(self, obj):
         """Check if the current user has upvoted this issue"""
+        # IssueViewSet annotates this on the queryset; fall back to a lookup
+        # for instances that were loaded elsewhere (e.g. after create).
+        if hasattr(obj, 'user_has_upvoted'):
+            return obj.user_has_upvoted
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             from .models import IssueUpvote
@@ -155,6 +193,21 @@ class IssueSerializer(serializers.ModelSerializer):
         return False
 
 
+class IssueListSerializer(SparseFieldsetMixin, IssueSerializer):
+    """Compact issue representation for feeds and cards"""
+    default_fields = ['id', 'title', 'location', 'category', 'status',
+                      'priority', 'author', 'author_email', 'author_name',
+                      'image_url', 'image_url_full', 'upvotes', 'comment_count',
+                      'latitude', 'longitude', 'created_at', 'updated_at', 'resolved_at',
+                      'time_text', 'user_has_upvoted']
+    expandable_fields = ['description', 'timeline']
+    # Only the latest entries, prefetched by IssueViewSet.get_queryset
+    timeline = IssueTimelineSerializer(source='recent_timeline', many=True, read_only=True)
+
+    class Meta(IssueSerializer.Meta):
+        pass
+
+
 class CommentSerializer(serializers.ModelSerializer):
     """Comment serializer"""
     user_name = serializers.SerializerMethodField()
@@ -176,7 +229,7 @@ class CommentSerializer(serializers.ModelSerializer):
     def get_is_own_comment(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            return obj.user == request.user
+            return obj.user_id == request.user.pk
         return False
 
 
@@ -224,6 +277,15 @@ class CampaignSerializer(serializers.ModelSerializer):
         return obj.image_url
 
 
+class CampaignCardSerializer(CampaignSerializer):
+    """Compact campaign representation for the donations grid"""
+    class Meta(CampaignSerializer.Meta):
+        fields = ['id', 'title', 'description', 'ngo', 'ngo_name', 'category',
+                  'image_url', 'image_url_full', 'goal_amount', 'raised_amount',
+                  'donor_count', 'is_verified', 'is_active', 'progress_percentage',
+                  'created_at']
+
+
 class CampaignCreateSerializer(serializers.ModelSerializer):
     """Campaign creation serializer"""
     budget_items = BudgetItemSerializer(many=True, required=False)
@@ -264,15 +326,8 @@ class DonationSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         validated_data['donor'] = self.context['request'].user
-        donation = Donation.objects.create(**validated_data)
-        
-        # Update campaign raised amount and donor count
-        campaign = donation.campaign
-        campaign.raised_amount += donation.amount
-        campaign.donor_count += 1
-        campaign.save()
-        
-        return donation
+        # Campaign totals are updated by the post_save signal
+        return Donation.objects.create(**validated_data)
 
 
 class TransparencyReportSerializer(serializers.ModelSerializer):
@@ -0,0 +1,247 @@
+"""
+Bulk ingestion of payment-gateway settlement files.
+
+A settlement file lists donations that were already captured by the
+gateway, one per CSV row or NDJSON line:
+
+    transaction_id, campaign, donor | donor_email, amount,
+    payment_method (optional), is_anonymous (optional)
+
+Rows are validated and de-duplicated on `transaction_id` (against the file
+itself and the donation table), then written with bulk_create in chunks.
+bulk_create skips the per-row Donation signals, so campaign totals and
+trending buckets are applied with one UPDATE per affected campaign (and
+hour) in the same transaction as the chunk's rows. Each chunk commits on
+its own, so a long import never holds SQLite's write lock for more than one
+chunk; if an import stops partway, running it again skips the rows that
+were committed as duplicates.
+"""
+import csv
+import io
+import json
+import time
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from . import cache, trending
+from .models import Campaign, CampaignDonationBucket, Donation, User
+
+DEFAULT_CHUNK_SIZE = 1000
+FORMATS = ('csv', 'ndjson')
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 't'}
+AMOUNT_FIELD = Donation._meta.get_field('amount')
+CENTS = Decimal(1).scaleb(-AMOUNT_FIELD.decimal_places)
+
+
+class SettlementError(ValueError):
+    """A settlement file that cannot be read at all"""
+
+
+def guess_format(filename):
+    """Return 'csv' or 'ndjson' from a file name, or None"""
+    name = (filename or '').lower()
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    return None
+
+
+def read_rows(stream, file_format):
+    """Yield (line_number, row_dict_or_None, error) from a text stream"""
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        if not reader.fieldnames:
+            return
+        for row in reader:
+            yield reader.line_num, {key.strip(): (value or '').strip() for key, value in row.items() if key}, None
+    elif file_format == 'ndjson':
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield line_number, None, f'invalid JSON: {exc}'
+                continue
+            if not isinstance(row, dict):
+                yield line_number, None, 'expected a JSON object'
+                continue
+            yield line_number, row, None
+    else:
+        raise SettlementError(f'Unsupported format {file_format!r}; expected one of {", ".join(FORMATS)}')
+
+
+def text_stream(binary_file):
+    """Wrap an uploaded (binary) file for read_rows"""
+    return io.TextIOWrapper(binary_file, encoding='utf-8-sig', newline='')
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _parse(row):
+    """Return (fields, None) for a usable row or (None, reason)"""
+    transaction_id = str(row.get('transaction_id') or '').strip()
+    if not transaction_id:
+        return None, 'missing transaction_id'
+    try:
+        amount = Decimal(str(row.get('amount', '')).strip())
+    except InvalidOperation:
+        return None, f'invalid amount {row.get("amount")!r}'
+    if not amount.is_finite() or amount <= 0:
+        return None, f'invalid amount {row.get("amount")!r}'
+    # Checked before quantize(), which raises InvalidOperation for values like 1e30
+    integer_digits = AMOUNT_FIELD.max_digits - AMOUNT_FIELD.decimal_places
+    if amount.adjusted() >= integer_digits or amount.quantize(CENTS).adjusted() >= integer_digits:
+        return None, f'amount {row.get("amount")!r} exceeds {AMOUNT_FIELD.max_digits} digits'
+    amount = amount.quantize(CENTS)
+    if amount == 0:
+        return None, f'invalid amount {row.get("amount")!r}'
+    try:
+        campaign_id = int(row.get('campaign') or row.get('campaign_id'))
+    except (TypeError, ValueError):
+        return None, 'missing or invalid campaign'
+    donor = row.get('donor') or row.get('donor_id')
+    donor_email = str(row.get('donor_email') or '').strip().lower()
+    if donor not in (None, ''):
+        try:
+            donor = int(donor)
+        except (TypeError, ValueError):
+            return None, f'invalid donor {donor!r}'
+    elif not donor_email:
+        return None, 'missing donor or donor_email'
+    else:
+        donor = None
+    return {
+        'transaction_id': transaction_id,
+        'amount': amount,
+        'campaign_id': campaign_id,
+        'donor_id': donor,
+        'donor_email': donor_email,
+        'payment_method': str(row.get('payment_method') or '')[:50],
+        'is_anonymous': str(row.get('is_anonymous', '')).strip().lower() in TRUE_VALUES,
+    }, None
+
+
+def ingest(rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Ingest (line_number, row, error) tuples from read_rows.
+
+    Returns a report dict: rows, created, duplicates, rejected
+    [(line, reason)], amount, campaigns, seconds and rows_per_second.
+    """
+    started = time.perf_counter()
+    report = {'rows': 0, 'created': 0, 'duplicates': 0, 'rejected': [], 'amount': Decimal('0')}
+    seen = set()
+    known_donors = set()  # (campaign_id, donor_id) pairs that already gave
+    campaigns = set()
+
+    for chunk in _chunks(rows, chunk_size):
+        report['rows'] += len(chunk)
+        parsed = []
+        for line_number, row, error in chunk:
+            if error is None:
+                fields, error = _parse(row)
+            if error is not None:
+                report['rejected'].append((line_number, error))
+            elif fields['transaction_id'] in seen:
+                report['duplicates'] += 1
+            else:
+                seen.add(fields['transaction_id'])
+                parsed.append((line_number, fields))
+
+        if parsed:
+            with transaction.atomic():
+                campaigns.update(_ingest_chunk(parsed, report, known_donors))
+
+    report['rejected'].sort()
+    report['campaigns'] = len(campaigns)
+    report['seconds'] = time.perf_counter() - started
+    report['rows_per_second'] = report['rows'] / report['seconds'] if report['seconds'] else 0
+    return report
+
+
+def _ingest_chunk(parsed, report, known_donors):
+    """Write one chunk of parsed rows and its totals; returns the campaign ids it touched"""
+    existing = set(Donation.objects.filter(
+        transaction_id__in=[fields['transaction_id'] for _, fields in parsed]
+    ).values_list('transaction_id', flat=True))
+    campaign_ids = set(Campaign.objects.filter(
+        pk__in={fields['campaign_id'] for _, fields in parsed}
+    ).values_list('pk', flat=True))
+    emails = {fields['donor_email'] for _, fields in parsed if fields['donor_id'] is None}
+    donor_ids = {fields['donor_id'] for _, fields in parsed if fields['donor_id'] is not None}
+    users_by_email = dict(User.objects.filter(email__in=emails).values_list('email', 'pk')) if emails else {}
+    valid_donor_ids = set(User.objects.filter(pk__in=donor_ids).values_list('pk', flat=True)) if donor_ids else set()
+
+    donations = []
+    for line_number, fields in parsed:
+        if fields['transaction_id'] in existing:
+            report['duplicates'] += 1
+            continue
+        if fields['campaign_id'] not in campaign_ids:
+            report['rejected'].append((line_number, f'unknown campaign {fields["campaign_id"]}'))
+            continue
+        donor_id = fields['donor_id']
+        if donor_id is None:
+            donor_id = users_by_email.get(fields['donor_email'])
+            if donor_id is None:
+                report['rejected'].append((line_number, f'unknown donor {fields["donor_email"]}'))
+                continue
+        elif donor_id not in valid_donor_ids:
+            report['rejected'].append((line_number, f'unknown donor {donor_id}'))
+            continue
+        donations.append(Donation(
+            campaign_id=fields['campaign_id'], donor_id=donor_id, amount=fields['amount'],
+            transaction_id=fields['transaction_id'], payment_method=fields['payment_method'],
+            is_anonymous=fields['is_anonymous'],
+        ))
+
+    if not donations:
+        return set()
+
+    pairs = {(donation.campaign_id, donation.donor_id) for donation in donations} - known_donors
+    if pairs:
+        known_donors.update(
+            pair for pair in Donation.objects.filter(
+                campaign_id__in={campaign_id for campaign_id, _ in pairs},
+                donor_id__in={donor_id for _, donor_id in pairs},
+            ).values_list('campaign_id', 'donor_id').distinct()
+            if pair in pairs
+        )
+
+    totals = defaultdict(lambda: [Decimal('0'), 0])
+    buckets = defaultdict(lambda: [Decimal('0'), 0])  # (campaign_id, hour) -> trending bucket
+    for donation in donations:
+        pair = (donation.campaign_id, donation.donor_id)
+        totals[donation.campaign_id][0] += donation.amount
+        if pair not in known_donors:
+            known_donors.add(pair)
+            totals[donation.campaign_id][1] += 1
+        report['amount'] += donation.amount
+
+    Donation.objects.bulk_create(donations)
+    report['created'] += len(donations)
+    for donation in donations:
+        bucket = buckets[(donation.campaign_id, trending.bucket_hour(donation.created_at))]
+        bucket[0] += donation.amount
+        bucket[1] += 1
+
+    for campaign_id, (amount, donors) in totals.items():
+        Campaign.apply_donation(campaign_id, amount, donors)
+    for (campaign_id, hour), (amount, count) in buckets.items():
+        CampaignDonationBucket.apply(campaign_id, hour, amount, count)
+    trending.refresh_campaigns(list(totals))
+    transaction.on_commit(lambda: cache.bump('donations', 'campaigns'))
+    return set(totals)
@@ -1,13 +1,211 @@
-from django.db.models.signals import post_save, post_delete
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
 from django.dispatch import receiver
-from django.db.models import Sum
-from .models import Donation, Campaign
+from django.db.models import F
+from django.utils import timezone
+from . import cache, trending
+from .models import (
+    Comment, Donation, Campaign, CampaignDonationBucket, Issue, IssueStatusCount, MapCluster, User,
+)
+
+# User fields shown on issues (author) and campaigns (NGO)
+USER_DISPLAY_FIELDS = ('email', 'username', 'first_name', 'last_name', 'organization_name')
+
+def _add_donation(campaign_id, donor_id, amount, pk, created_at):
+    new_donor = not Donation.has_other_donations(campaign_id, donor_id, pk)
+    Campaign.apply_donation(campaign_id, amount, 1 if new_donor else 0)
+    trending.record(campaign_id, created_at, amount, 1)
+
+
+def _remove_donation(campaign_id, donor_id, amount, pk, created_at):
+    last_donation = not Donation.has_other_donations(campaign_id, donor_id, pk)
+    Campaign.apply_donation(campaign_id, -amount, -1 if last_donation else 0)
+    trending.record(campaign_id, created_at, -amount, -1)
+
 
 @receiver(post_save, sender=Donation)
+def add_donation_to_campaign(sender, instance, created, **kwargs):
+    if created:
+        _add_donation(instance.campaign_id, instance.donor_id, instance.amount, instance.pk, instance.created_at)
+        return
+    old = getattr(instance, '_loaded_values', None)
+    if not old or all(old[name] == getattr(instance, name) for name in Donation.TRACKED_FIELDS):
+        return
+    # An edit moves the donation: take the old one out, put the new one in
+    _remove_donation(old['campaign_id'], old['donor_id'], old['amount'], instance.pk, instance.created_at)
+    _add_donation(instance.campaign_id, instance.donor_id, instance.amount, instance.pk, instance.created_at)
+
+
+def _remove_donations(donations, deleted_campaigns):
+    """Grouped counterpart of _remove_donation, once every row in `donations` is gone"""
+    totals = defaultdict(lambda: [Decimal(0), set()])
+    buckets = defaultdict(lambda: [Decimal(0), 0])
+    cutoff = timezone.now() - trending.LONGEST_WINDOW
+    for campaign_id, donor_id, amount, created_at in donations:
+        if campaign_id in deleted_campaigns:
+            continue
+        totals[campaign_id][0] += amount
+        totals[campaign_id][1].add(donor_id)
+        if created_at >= cutoff:
+            bucket = buckets[(campaign_id, trending.bucket_hour(created_at))]
+            bucket[0] += amount
+            bucket[1] += 1
+    if not totals:
+        return
+
+    remaining = set(Donation.objects.filter(
+        campaign_id__in=totals, donor_id__in={donor for _, donors in totals.values() for donor in donors},
+    ).values_list('campaign_id', 'donor_id').distinct())
+    for campaign_id, (amount, donors) in totals.items():
+        lost = sum(1 for donor_id in donors if (campaign_id, donor_id) not in remaining)
+        Campaign.apply_donation(campaign_id, -amount, -lost)
+    for (campaign_id, hour), (amount, count) in buckets.items():
+        CampaignDonationBucket.apply(campaign_id, hour, -amount, -count)
+    trending.refresh_campaigns(list(totals))
+
+
+# Cascading and queryset deletes remove every row before post_delete is sent,
+# so per-row checks for the donor's other donations would find none and count
+# one lost donor per donation. Those deletes are gathered per origin in
+# pre_delete (sent for all rows first) and applied in one grouped pass after
+# the last row's post_delete.
+def _pending_removals(origin):
+    pending = getattr(origin, '_donation_removals', None)
+    if pending is None or pending['deleting']:
+        # A leftover from a delete that failed midway is not carried over
+        pending = {'donations': [], 'campaigns': set(), 'waiting': 0, 'deleting': False}
+        origin._donation_removals = pending
+    return pending
+
+
+@receiver(pre_delete, sender=Donation)
+def collect_donation_removal(sender, instance, origin=None, **kwargs):
+    if origin is None or isinstance(origin, (Donation, Campaign)):
+        return
+    pending = _pending_removals(origin)
+    pending['donations'].append((instance.campaign_id, instance.donor_id, instance.amount, instance.created_at))
+    pending['waiting'] += 1
+
+
+@receiver(pre_delete, sender=Campaign)
+def collect_campaign_removal(sender, instance, origin=None, **kwargs):
+    # E.g. an NGO account deleted with its campaigns: their totals need no update
+    if origin is None or isinstance(origin, Campaign):
+        return
+    _pending_removals(origin)['campaigns'].add(instance.pk)
+
+
 @receiver(post_delete, sender=Donation)
-def update_campaign_raised_amount(sender, instance, **kwargs):
-    campaign = instance.campaign
-    if campaign:
-        total_raised = Donation.objects.filter(campaign=campaign).aggregate(Sum('amount'))['amount__sum'] or 0
-        campaign.raised_amount = total_raised
-        campaign.save()
\ No newline at end of file
+def remove_donation_from_campaign(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, Campaign):
+        return  # the campaign itself is going away with its donations
+    if origin is None or isinstance(origin, Donation):
+        _remove_donation(instance.campaign_id, instance.donor_id, instance.amount, instance.pk, instance.created_at)
+        return
+    pending = origin._donation_removals
+    pending['deleting'] = True
+    pending['waiting'] -= 1
+    if pending['waiting'] == 0:
+        del origin._donation_removals
+        _remove_donations(pending['donations'], pending['campaigns'])
+
+
+def _cluster_key(values):
+    return (values['geohash'], values['category'], values['status'],
+            values['latitude'], values['longitude'])
+
+
+@receiver(post_save, sender=Issue)
+def update_map_clusters(sender, instance, created, **kwargs):
+    new = _cluster_key({name: getattr(instance, name) for name in Issue.TRACKED_FIELDS})
+    old = getattr(instance, '_original', None)
+    old = _cluster_key(old) if old else None
+    if old == new:
+        return
+    if old:
+        MapCluster.apply(*old, sign=-1)
+    MapCluster.apply(*new, sign=1)
+
+
+@receiver(post_delete, sender=Issue)
+def remove_from_map_clusters(sender, instance, **kwargs):
+    MapCluster.apply(*_cluster_key({name: getattr(instance, name) for name in Issue.TRACKED_FIELDS}), sign=-1)
+
+
+@receiver(post_save, sender=Issue)
+def update_status_counts(sender, instance, created, **kwargs):
+    old = getattr(instance, '_original', None)
+    if old and (old['status'], old['category']) == (instance.status, instance.category):
+        return
+    if old:
+        IssueStatusCount.apply(old['status'], old['category'], -1)
+    IssueStatusCount.apply(instance.status, instance.category, 1)
+
+
+@receiver(post_delete, sender=Issue)
+def decrement_status_counts(sender, instance, **kwargs):
+    IssueStatusCount.apply(instance.status, instance.category, -1)
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    if not created:
+        return
+    # Touching updated_at refreshes the issue's ETag as well
+    Issue.objects.filter(pk=instance.issue_id).update(
+        comment_count=F('comment_count') + 1, updated_at=timezone.now()
+    )
+    Issue.refresh_hot_scores([instance.issue_id])
+    transaction.on_commit(lambda: cache.bump('issues'))
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, Issue):
+        return  # the issue itself is going away with its comments
+    Issue.objects.filter(pk=instance.issue_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1, updated_at=timezone.now()
+    )
+    Issue.refresh_hot_scores([instance.issue_id])
+    transaction.on_commit(lambda: cache.bump('issues'))
+
+
+@receiver(post_save, sender=Issue)
+@receiver(post_delete, sender=Issue)
+def invalidate_issue_responses(sender, instance, **kwargs):
+    transaction.on_commit(lambda: cache.bump('issues'))
+
+
+@receiver(post_save, sender=Campaign)
+@receiver(post_delete, sender=Campaign)
+def invalidate_campaign_responses(sender, instance, **kwargs):
+    transaction.on_commit(lambda: cache.bump('campaigns'))
+
+
+@receiver(post_save, sender=Donation)
+@receiver(post_delete, sender=Donation)
+def invalidate_donation_responses(sender, instance, **kwargs):
+    transaction.on_commit(lambda: cache.bump('donations', 'campaigns'))
+
+
+@receiver(pre_save, sender=User)
+def remember_display_fields(sender, instance, update_fields=None, **kwargs):
+    instance._display_before = None
+    if instance.pk is None or (update_fields is not None and set(update_fields).isdisjoint(USER_DISPLAY_FIELDS)):
+        return  # e.g. the last_login update on every sign-in
+    instance._display_before = User.objects.filter(pk=instance.pk).values_list(*USER_DISPLAY_FIELDS).first()
+
+
+@receiver(post_save, sender=User)
+def touch_displayed_rows(sender, instance, created, **kwargs):
+    before = getattr(instance, '_display_before', None)
+    if created or before is None or before == tuple(getattr(instance, name) for name in USER_DISPLAY_FIELDS):
+        return
+    # The rows did not change, but their payloads did: move their ETags
+    now = timezone.now()
+    Issue.objects.filter(author=instance).update(updated_at=now)
+    Campaign.objects.filter(ngo=instance).update(updated_at=now)
+    transaction.on_commit(lambda: cache.bump('issues', 'campaigns'))
@@ -0,0 +1,46 @@
+"""
+Per-connection SQLite tuning.
+
+Django 5.0 has no setting for SQLite PRAGMAs, so they are applied from the
+connection_created signal: every new connection runs the PRAGMAs in
+settings.SQLITE_PRAGMAS (empty unless DATABASE_PROFILE=production).
+journal_mode=WAL is stored in the database file, but the other PRAGMAs
+only last for the connection that ran them.
+"""
+from django.conf import settings
+
+# PRAGMA values are interpolated, so only accept plain words and numbers
+_ALLOWED = str.isalnum
+
+
+def pragma_statements(pragmas):
+    statements = []
+    for name, value in pragmas.items():
+        if not (_ALLOWED(name.replace('_', '')) and _ALLOWED(str(value).lstrip('-'))):
+            raise ValueError(f'Invalid SQLite PRAGMA {name}={value!r}')
+        statements.append(f'PRAGMA {name} = {value}')
+    return statements
+
+
+def apply_pragmas(connection, pragmas):
+    with connection.cursor() as cursor:
+        for statement in pragma_statements(pragmas):
+            cursor.execute(statement)
+
+
+def configure_connection(sender, connection, **kwargs):
+    """connection_created receiver"""
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', None)
+    if connection.vendor == 'sqlite' and pragmas:
+        apply_pragmas(connection, pragmas)
+
+
+def current_pragmas(connection, names):
+    """Return {name: value} as SQLite reports them for this connection"""
+    values = {}
+    with connection.cursor() as cursor:
+        for name in names:
+            cursor.execute(f'PRAGMA {name}')
+            row = cursor.fetchone()
+            values[name] = row[0] if row else None
+    return values
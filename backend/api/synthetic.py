@@ -0,0 +1,437 @@
+"""
+Synthetic data at benchmark scale.
+
+`generate(issues=N)` bulk-inserts N issues together with proportional users,
+upvotes, comments, timelines, campaigns, budget items, donations and
+transparency reports. Rows are written with bulk_create and explicit
+primary keys, so no per-row signals run; the derived state they would have
+maintained is written directly instead:
+
+- Issue.upvotes / comment_count / hot_score / geohash match the inserted rows
+- Campaign.raised_amount / donor_count match the inserted donations
+- IssueStatusCount, MapCluster, donation buckets, trending scores and the
+  FTS indexes are rebuilt at the end
+
+For a given seed and scale the same rows are generated on every run
+(relative to the current time), so runs are comparable across commits.
+"""
+import io
+import random
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from . import cache, geo, hot, search, trending
+from .models import (
+    BudgetItem, Campaign, CampaignDonationBucket, Comment, Donation, Issue, IssueStatusCount,
+    IssueTimeline, IssueUpvote, TransparencyReport, User,
+)
+
+DEFAULT_PASSWORD = 'Sudhaar123!@#'
+BATCH_SIZE = 2000
+# Issues are spread over this many days before "now"
+HISTORY_DAYS = 365
+
+CITIES = [
+    # (name, latitude, longitude)
+    ('Lahore', 31.5204, 74.3587),
+    ('Karachi', 24.8607, 67.0011),
+    ('Islamabad', 33.6844, 73.0479),
+    ('Narowal', 32.1014, 74.8800),
+    ('Faisalabad', 31.4504, 73.1350),
+    ('Multan', 30.1575, 71.5249),
+]
+AREAS = ['Model Town', 'Main Chowk', 'Siddique Pura', 'Park Road', 'Railway Colony', 'Civil Lines',
+         'Gulberg', 'Old City', 'Canal View', 'Satellite Town']
+PROBLEMS = {
+    'Roads': ['Deep pothole', 'Broken road surface', 'Missing speed breaker', 'Collapsed culvert'],
+    'Sanitation': ['Choked sewer line', 'Overflowing drain', 'Garbage not collected', 'Open manhole'],
+    'Electricity': ['Broken street lights', 'Sparking transformer', 'Loose overhead wires', 'Daily outages'],
+    'Water': ['Pipeline leakage', 'Contaminated supply', 'No water for days', 'Broken hand pump'],
+    'Civic': ['Encroached footpath', 'Illegal parking', 'Damaged bus stop', 'Unsafe market stalls'],
+    'Health': ['Closed dispensary', 'Stray dog attacks', 'Mosquito breeding', 'No ambulance access'],
+    'Environment': ['Trees cut illegally', 'Smoke from kilns', 'Dumping in canal', 'Park turned to landfill'],
+    'Education': ['School roof leaking', 'No teachers posted', 'Broken school boundary wall', 'No drinking water at school'],
+    'Other': ['Noise at night', 'Abandoned vehicle', 'Unclear signage', 'Damaged public toilet'],
+}
+CAMPAIGN_CATEGORIES = [value for value, _ in Campaign.CATEGORY_CHOICES]
+STATUS_WEIGHTS = {
+    'Open': 30, 'Pending': 15, 'Verified': 10, 'In Progress': 15, 'Critical': 3, 'Resolved': 22, 'Rejected': 5,
+}
+PRIORITY_WEIGHTS = {None: 30, 'Low': 20, 'Medium': 25, 'High': 18, 'Critical': 7}
+COMMENTS = ['Same problem in our street.', 'Reported this last month as well.', 'Any update on this?',
+            'The team visited today.', 'Still not fixed.', 'Thank you for raising this.']
+PAYMENT_METHODS = ['card', 'jazzcash', 'easypaisa', 'bank_transfer']
+
+# Named accounts for logging in by hand; they take part in the generated
+# data like any other user. (email, username, first name, last name, phone,
+# CNIC, role, organization, verified)
+DEMO_ACCOUNTS = [
+    ('ali.khan@example.com', 'alikhan', 'Ali', 'Khan', '0300-1234567', '35202-1234567-1',
+     'citizen', None, False),
+    ('sara.ahmed@example.com', 'saraahmed', 'Sara', 'Ahmed', '0301-2345678', '35202-2345678-2',
+     'citizen', None, False),
+    ('ahmad.hassan@example.com', 'ahmadhassan', 'Ahmad', 'Hassan', '0302-3456789', '35202-3456789-3',
+     'citizen', None, False),
+    ('fatima.ali@example.com', 'fatimaali', 'Fatima', 'Ali', '0303-4567890', '35202-4567890-4',
+     'citizen', None, False),
+    ('muhammad.raza@example.com', 'muhammadraza', 'Muhammad', 'Raza', '0304-5678901', '35202-5678901-5',
+     'citizen', None, False),
+    ('greenlahore@ngo.com', 'greenlahore', 'Green', 'Lahore Trust', '0305-6789012', '35202-6789012-6',
+     'ngo', 'Green Lahore Trust', True),
+    ('alkhidmat@ngo.com', 'alkhidmat', 'Al-Khidmat', 'Foundation', '0306-7890123', '35202-7890123-7',
+     'ngo', 'Al-Khidmat Foundation', True),
+    ('citizensfoundation@ngo.com', 'tcf', 'The Citizens', 'Foundation', '0307-8901234', '35202-8901234-8',
+     'ngo', 'The Citizens Foundation', True),
+    ('solarngo@ngo.com', 'solarngo', 'Solar', 'Energy NGO', '0308-9012345', '35202-9012345-9',
+     'ngo', 'Solar Energy Initiative', False),
+    ('mayor@narowal.gov.pk', 'mayor', 'City', 'Mayor', '0309-0123456', '35202-0123456-0',
+     'official', 'Narowal City Council', True),
+    ('wasa@narowal.gov.pk', 'wasa_official', 'WASA', 'Official', '0310-1234567', '35202-1234567-1',
+     'official', 'Water and Sanitation Authority', True),
+    ('traffic@narowal.gov.pk', 'traffic_police', 'Traffic', 'Police', '0311-2345678', '35202-2345678-2',
+     'official', 'Traffic Police Department', True),
+]
+
+
+def scale_counts(issues, **overrides):
+    """Row counts for the other tables at a given number of issues"""
+    counts = {
+        'issues': issues,
+        'citizens': max(100, issues // 5),
+        'officials': max(3, issues // 20000),
+        'ngos': max(5, issues // 2000),
+        'campaigns': max(10, issues // 200),
+        'donations': max(100, issues // 2),
+        'reports': 12,
+    }
+    counts.update((name, value) for name, value in overrides.items() if value is not None)
+    return counts
+
+
+def parse_scale(value):
+    """'10k' -> 10000, '1M' -> 1000000, '2500' -> 2500"""
+    value = str(value).strip()
+    multiplier = {'k': 1000, 'm': 1000000}.get(value[-1:].lower(), 1)
+    number = value[:-1] if multiplier != 1 else value
+    try:
+        count = int(float(number) * multiplier)
+    except ValueError:
+        raise ValueError(f'Invalid scale {value!r}; use e.g. 10k, 100k or 1M') from None
+    if count <= 0:
+        raise ValueError(f'Invalid scale {value!r}; it must be positive')
+    return count
+
+
+@contextmanager
+def manual_timestamps(*models):
+    """Let bulk_create keep the created_at/updated_at values set on the instances"""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _next_pk(model):
+    return (model.objects.aggregate(top=Max('pk'))['top'] or 0) + 1
+
+
+def _weighted(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _skewed_count(rng, mean, cap):
+    """Long-tailed count: most rows get a few, a handful get very many"""
+    # Pareto with alpha 1.5 has mean 3; rescale to the requested mean
+    return min(cap, int((rng.paretovariate(1.5) - 1) * mean / 2))
+
+
+def _bulk(model, rows, batch_size):
+    model.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
+
+
+class Generator:
+    def __init__(self, counts, seed, batch_size, password, demo_accounts, log):
+        self.rng = random.Random(seed)
+        self.counts = counts
+        self.demo_accounts = demo_accounts
+        self.batch_size = batch_size
+        self.password = password
+        self.log = log
+        self.now = timezone.now()
+        self.inserted = Counter()
+        self.buckets = defaultdict(lambda: [Decimal('0'), 0])  # (campaign_id, hour) -> trending bucket
+
+    def run(self):
+        fts = search.is_supported(connection)
+        if fts:
+            # Rebuilding the FTS indexes once is cheaper than maintaining them per row
+            search.uninstall(connection)
+        try:
+            with transaction.atomic(), manual_timestamps(
+                User, Issue, IssueUpvote, Comment, IssueTimeline, Campaign, Donation, TransparencyReport
+            ):
+                self.create_users()
+                self.create_issues()
+                self.create_campaigns()
+                self.create_donations()
+                self.create_reports()
+                self.rebuild_derived()
+        finally:
+            if fts:
+                self.step('Rebuilding search indexes', lambda: (search.install(connection), search.rebuild(connection)))
+        cache.bump('issues', 'campaigns', 'donations')
+        return dict(self.inserted)
+
+    def step(self, label, func):
+        started = time.perf_counter()
+        result = func()
+        self.log(f'{label}: {time.perf_counter() - started:.1f}s')
+        return result
+
+    def random_time(self, since, until=None):
+        until = until or self.now
+        span = max((until - since).total_seconds(), 0)
+        return since + timedelta(seconds=self.rng.random() * span)
+
+    # Users ---------------------------------------------------------------
+
+    def create_users(self):
+        # One hash for everyone: hashing per user dominates seeding time otherwise
+        password = make_password(self.password)
+        first_pk = _next_pk(User)
+        users = []
+        pools = {'citizen': [], 'official': [], 'ngo': []}
+        if self.demo_accounts:
+            existing = dict(User.objects.filter(
+                email__in=[account[0] for account in DEMO_ACCOUNTS]
+            ).values_list('email', 'pk'))
+            for email, username, first, last, phone, cnic, role, organization, verified in DEMO_ACCOUNTS:
+                if email in existing:
+                    pools[role].append(existing[email])
+                    continue
+                pk = first_pk + len(users)
+                joined = self.now - timedelta(days=HISTORY_DAYS + 30)
+                users.append(User(
+                    pk=pk, username=username, email=email, password=password, first_name=first,
+                    last_name=last, phone=phone, cnic=cnic, role=role, organization_name=organization,
+                    is_verified=verified, date_joined=joined, created_at=joined, updated_at=joined,
+                ))
+        for role, count in (('citizen', self.counts['citizens']), ('official', self.counts['officials']),
+                            ('ngo', self.counts['ngos'])):
+            for _ in range(count):
+                pk = first_pk + len(users)
+                joined = self.now - timedelta(days=HISTORY_DAYS + 30) + timedelta(minutes=pk % 43200)
+                users.append(User(
+                    pk=pk, username=f'{role}{pk}', email=f'{role}{pk}@example.com', password=password,
+                    first_name=role.title(), last_name=str(pk), role=role, is_verified=role != 'citizen',
+                    organization_name=f'Relief Foundation {pk}' if role == 'ngo' else None,
+                    date_joined=joined, created_at=joined, updated_at=joined,
+                ))
+        self.inserted['users'] += self.step('Users', lambda: _bulk(User, users, self.batch_size))
+        for user in users:
+            pools[user.role].append(user.pk)
+        self.citizens, self.officials, self.ngos = pools['citizen'], pools['official'], pools['ngo']
+
+    # Issues and their children --------------------------------------------
+
+    def create_issues(self):
+        started = time.perf_counter()
+        next_pk = {model: _next_pk(model) for model in (Issue, IssueUpvote, Comment, IssueTimeline)}
+        remaining = self.counts['issues']
+        while remaining:
+            size = min(self.batch_size, remaining)
+            remaining -= size
+            issues, upvotes, comments, timeline = [], [], [], []
+            for _ in range(size):
+                issue = self.build_issue(next_pk[Issue])
+                next_pk[Issue] += 1
+                voters = self.rng.sample(self.citizens, _skewed_count(self.rng, 3, min(500, len(self.citizens))))
+                for user_id in voters:
+                    upvotes.append(IssueUpvote(pk=next_pk[IssueUpvote], issue_id=issue.pk, user_id=user_id,
+                                               created_at=self.random_time(issue.created_at)))
+                    next_pk[IssueUpvote] += 1
+                comment_count = _skewed_count(self.rng, 1, 200)
+                for _ in range(comment_count):
+                    created = self.random_time(issue.created_at)
+                    comments.append(Comment(pk=next_pk[Comment], issue_id=issue.pk,
+                                            user_id=self.rng.choice(self.citizens),
+                                            text=self.rng.choice(COMMENTS), created_at=created, updated_at=created))
+                    next_pk[Comment] += 1
+                for entry in self.build_timeline(issue):
+                    entry.pk = next_pk[IssueTimeline]
+                    next_pk[IssueTimeline] += 1
+                    timeline.append(entry)
+                issue.upvotes = len(voters)
+                issue.comment_count = comment_count
+                issue.hot_score = hot.score(issue.upvotes, issue.comment_count, issue.priority,
+                                            issue.status, issue.created_at)
+                issues.append(issue)
+            self.inserted['issues'] += _bulk(Issue, issues, self.batch_size)
+            self.inserted['upvotes'] += _bulk(IssueUpvote, upvotes, self.batch_size)
+            self.inserted['comments'] += _bulk(Comment, comments, self.batch_size)
+            self.inserted['timeline'] += _bulk(IssueTimeline, timeline, self.batch_size)
+            done = self.counts['issues'] - remaining
+            if done % (self.batch_size * 25) == 0 or not remaining:
+                self.log(f'Issues: {done}/{self.counts["issues"]} ({time.perf_counter() - started:.1f}s)')
+
+    def build_issue(self, pk):
+        category = self.rng.choice(list(PROBLEMS))
+        city, latitude, longitude = self.rng.choice(CITIES)
+        area = self.rng.choice(AREAS)
+        status = _weighted(self.rng, STATUS_WEIGHTS)
+        created = self.now - timedelta(seconds=self.rng.random() ** 2 * HISTORY_DAYS * 86400)
+        issue = Issue(
+            pk=pk, title=f'{self.rng.choice(PROBLEMS[category])} in {area}',
+            description=f'{self.rng.choice(PROBLEMS[category])} reported near {area}, {city}. '
+                        f'Residents have been affected for {self.rng.randint(1, 60)} days.',
+            location=f'{area}, {city}', category=category, status=status,
+            priority=_weighted(self.rng, PRIORITY_WEIGHTS), author_id=self.rng.choice(self.citizens),
+            latitude=Decimal(f'{latitude + self.rng.uniform(-0.08, 0.08):.6f}'),
+            longitude=Decimal(f'{longitude + self.rng.uniform(-0.08, 0.08):.6f}'),
+            created_at=created, updated_at=created,
+        )
+        issue.geohash = geo.encode(issue.latitude, issue.longitude)
+        if status == 'Resolved':
+            issue.resolved_at = self.random_time(created)
+            issue.resolved_by_id = self.rng.choice(self.officials)
+            issue.updated_at = issue.resolved_at
+        return issue
+
+    def build_timeline(self, issue):
+        entries = [IssueTimeline(issue_id=issue.pk, status='Open', description='Issue reported.',
+                                 created_by_id=issue.author_id, created_at=issue.created_at)]
+        if issue.status != 'Open':
+            entries.append(IssueTimeline(
+                issue_id=issue.pk, status=issue.status,
+                description=f'Status updated from Open to {issue.status}.',
+                created_by_id=issue.resolved_by_id or self.rng.choice(self.officials),
+                created_at=issue.resolved_at or self.random_time(issue.created_at),
+            ))
+        return entries
+
+    # Campaigns and donations ----------------------------------------------
+
+    def create_campaigns(self):
+        pk, item_pk = _next_pk(Campaign), _next_pk(BudgetItem)
+        campaigns, items = [], []
+        for _ in range(self.counts['campaigns']):
+            category = self.rng.choice(CAMPAIGN_CATEGORIES)
+            created = self.now - timedelta(seconds=self.rng.random() * HISTORY_DAYS * 86400)
+            goal = Decimal(self.rng.randrange(50, 5000) * 1000)
+            campaigns.append(Campaign(
+                pk=pk, title=f'{category} relief fund #{pk}', ngo_id=self.rng.choice(self.ngos),
+                description=f'Help us deliver {category.lower()} support to families in need.',
+                category=category, goal_amount=goal, is_verified=self.rng.random() < 0.8,
+                is_active=self.rng.random() < 0.9, created_at=created, updated_at=created,
+            ))
+            shares = [Decimal('0.5'), Decimal('0.3'), Decimal('0.2')]
+            for index, share in enumerate(shares):
+                items.append(BudgetItem(pk=item_pk, campaign_id=pk, item_name=f'Budget line {index + 1}',
+                                        total_cost=goal * share))
+                item_pk += 1
+            pk += 1
+        self.inserted['campaigns'] += _bulk(Campaign, campaigns, self.batch_size)
+        self.inserted['budget_items'] += _bulk(BudgetItem, items, self.batch_size)
+        self.campaigns = campaigns
+
+    def create_donations(self):
+        started = time.perf_counter()
+        pk = _next_pk(Donation)
+        # A few popular campaigns take most donations
+        weights = [1 / (rank + 1) for rank in range(len(self.campaigns))]
+        totals = defaultdict(lambda: [Decimal('0'), set()])
+        remaining = self.counts['donations']
+        while remaining:
+            size = min(self.batch_size, remaining)
+            remaining -= size
+            donations = []
+            for campaign in self.rng.choices(self.campaigns, weights=weights, k=size):
+                donor_id = self.rng.choice(self.citizens)
+                amount = Decimal(self.rng.choice((500, 1000, 2000, 5000, 10000, 25000)))
+                donations.append(Donation(
+                    pk=pk, campaign_id=campaign.pk, donor_id=donor_id, amount=amount,
+                    is_anonymous=self.rng.random() < 0.1, payment_method=self.rng.choice(PAYMENT_METHODS),
+                    transaction_id=f'SYN-{pk:09d}', created_at=self.random_time(campaign.created_at),
+                ))
+                totals[campaign.pk][0] += amount
+                totals[campaign.pk][1].add(donor_id)
+                pk += 1
+            self.inserted['donations'] += _bulk(Donation, donations, self.batch_size)
+            self.record_buckets(donations)
+        for campaign in self.campaigns:
+            amount, donors = totals[campaign.pk]
+            campaign.raised_amount, campaign.donor_count = amount, len(donors)
+        Campaign.objects.bulk_update(self.campaigns, ['raised_amount', 'donor_count'], batch_size=self.batch_size)
+        self.log(f'Donations: {self.inserted["donations"]} ({time.perf_counter() - started:.1f}s)')
+
+    def record_buckets(self, donations):
+        cutoff = self.now - trending.LONGEST_WINDOW
+        for donation in donations:
+            if donation.created_at >= cutoff:
+                bucket = self.buckets[(donation.campaign_id, trending.bucket_hour(donation.created_at))]
+                bucket[0] += donation.amount
+                bucket[1] += 1
+
+    def create_reports(self):
+        reports = []
+        admin_id = self.officials[0]
+        for month in range(self.counts['reports']):
+            created = self.now - timedelta(days=30 * month)
+            donated = Decimal(self.rng.randrange(1000, 10000) * 1000)
+            utilized = (donated * Decimal(self.rng.randrange(40, 95)) / 100).quantize(Decimal('0.01'))
+            reports.append(TransparencyReport(
+                title=f'Monthly report {created:%B %Y}', description='Funds received and spent this month.',
+                total_funds_donated=donated, funds_utilized=utilized, available_balance=donated - utilized,
+                created_by_id=admin_id, created_at=created,
+            ))
+        self.inserted['reports'] += _bulk(TransparencyReport, reports, self.batch_size)
+
+    # Derived state ---------------------------------------------------------
+
+    def rebuild_derived(self):
+        def status_counts():
+            IssueStatusCount.objects.all().delete()
+            counts = Counter(Issue.objects.values_list('status', 'category').iterator(chunk_size=10000))
+            IssueStatusCount.objects.bulk_create(
+                IssueStatusCount(status=status, category=category, count=count)
+                for (status, category), count in counts.items()
+            )
+
+        def buckets():
+            for (campaign_id, hour), (amount, count) in self.buckets.items():
+                CampaignDonationBucket.apply(campaign_id, hour, amount, count)
+            trending.refresh_all(self.now)
+
+        self.step('Issue status counters', status_counts)
+        self.step('Map clusters', lambda: call_command('rebuild_clusters', stdout=io.StringIO()))
+        self.step('Trending scores', buckets)
+
+
+def generate(issues, seed=42, batch_size=BATCH_SIZE, password=DEFAULT_PASSWORD, demo_accounts=False,
+             log=lambda message: None, **counts):
+    """
+    Insert synthetic data for `issues` issues; returns {table: rows inserted}.
+
+    Other volumes follow scale_counts() unless given as keyword arguments
+    (citizens, officials, ngos, campaigns, donations, reports).
+    """
+    return Generator(scale_counts(issues, **counts), seed, batch_size, password, demo_accounts, log).run()
+
@@ -0,0 +1,342 @@
+import re
+import unittest
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from .models import BudgetItem, Campaign, Comment, Donation, Issue, TransparencyReport, User
+from .pagination import IssuePagination
+
+
+def make_user(email, role='citizen', **extra):
+    return User.objects.create_user(email=email, username=email.split('@')[0], password='x', role=role, **extra)
+
+
+class IssueListQueryCountTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('citizen@example.com')
+        author = make_user('author@example.com')
+        for index in range(25):
+            issue = Issue.objects.create(
+                title=f'Issue {index}', description='Details', location='Model Town',
+                category='Roads', author=author,
+            )
+            if index % 2:
+                issue.add_upvote(cls.user)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        for page_size in (5, 20):
+            with self.subTest(page_size=page_size), mock.patch.object(IssuePagination, 'page_size', page_size):
+                # The ETag watermark (per-process test cache), COUNT(*) and the
+                # page itself, with user_has_upvoted annotated
+                with self.assertNumQueries(3):
+                    response = self.client.get('/api/issues/')
+                self.assertEqual(response.status_code, 200)
+                results = response.json()['results']
+                self.assertEqual(len(results), page_size)
+                self.assertEqual(
+                    {issue['title'] for issue in results if issue['user_has_upvoted']},
+                    {f'Issue {index}' for index in range(1, 25, 2)} & {issue['title'] for issue in results},
+                )
+
+
+class CampaignQueryCountTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('citizen@example.com')
+        donors = [make_user(f'donor{index}@example.com') for index in range(3)]
+        cls.campaigns = []
+        for index in range(3):
+            ngo = make_user(f'ngo{index}@example.com', role='ngo', organization_name=f'NGO {index}')
+            campaign = Campaign.objects.create(
+                title=f'Campaign {index}', description='Details', ngo=ngo, category='Education',
+                goal_amount=1000, is_verified=True,
+            )
+            for item in range(3):
+                BudgetItem.objects.create(campaign=campaign, item_name=f'Item {item}', total_cost=100)
+            for donor in donors:
+                Donation.objects.create(campaign=campaign, donor=donor, amount=10)
+            cls.campaigns.append(campaign)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_list(self):
+        # The ETag watermark, COUNT(*) and the page with the NGO joined; cards
+        # have no budget items
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/campaigns/')
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(len(results), 3)
+        self.assertNotIn('budget_items', results[0])
+
+    def test_detail(self):
+        # The ETag lookup, the campaign with its NGO, and its budget items
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/campaigns/{self.campaigns[0].pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['budget_items']), 3)
+
+    def test_donations(self):
+        # The campaign, then one page of its donations with donors joined
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/campaigns/{self.campaigns[0].pk}/donations/?page_size=2')
+        self.assertEqual(response.status_code, 200)
+        page = response.json()
+        self.assertEqual(len(page['results']), 2)
+        response = self.client.get(page['next'])
+        self.assertEqual(len(response.json()['results']), 1)
+        self.assertIsNone(response.json()['next'])
+
+
+FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?(\S+)(?: AS \S+)?$')
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'reads SQLite EXPLAIN QUERY PLAN output')
+class QueryPlanTests(APITestCase):
+    """
+    Every SELECT an endpoint runs, including the ETag validator that runs
+    before the response cache, must use an index rather than scan a table.
+    """
+    # (path, user, full scans allowed); {issue} and {campaign} are filled in
+    ENDPOINTS = [
+        ('/api/issues/', None, ()),
+        ('/api/issues/', 'citizen', ()),
+        ('/api/issues/?status=Open', None, ()),
+        ('/api/issues/?exclude_resolved=1', None, ()),
+        ('/api/issues/?resolved_only=1', None, ()),
+        ('/api/issues/?my_reports=1', 'citizen', ()),
+        ('/api/issues/?category=Roads&status=Open', None, ()),
+        ('/api/issues/?ordering=-upvotes', None, ()),
+        ('/api/issues/?ordering=hot', None, ()),
+        ('/api/issues/?pagination=cursor', 'citizen', ()),
+        ('/api/issues/?search=water', None, ()),
+        ('/api/issues/?bbox=74.2,31.4,74.5,31.6', None, ()),
+        ('/api/issues/{issue}/', 'citizen', ()),
+        ('/api/issues/{issue}/comments/', 'citizen', ()),
+        ('/api/issues/{issue}/timeline/', 'citizen', ()),
+        ('/api/campaigns/', None, ()),
+        ('/api/campaigns/?ordering=trending', None, ()),
+        ('/api/campaigns/?search=school', None, ()),
+        ('/api/campaigns/', 'ngo', ()),
+        ('/api/campaigns/{campaign}/', None, ()),
+        ('/api/campaigns/{campaign}/donations/', 'citizen', ()),
+        ('/api/donations/', 'citizen', ()),
+        ('/api/donations/', 'staff', ()),
+        ('/api/transparency/', None, ()),
+        # Unfiltered and unordered, so LIMIT stops the scan after one page
+        ('/api/users/', 'staff', ('api_user',)),
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = {
+            'citizen': make_user('citizen@example.com'),
+            'ngo': make_user('ngo@example.com', role='ngo', organization_name='Green Schools'),
+            'staff': make_user('staff@example.com', is_staff=True),
+        }
+        cls.issue = Issue.objects.create(
+            title='No water for days', description='Details', location='Model Town', category='Water',
+            author=cls.users['citizen'], latitude=31.48, longitude=74.32,
+        )
+        cls.issue.status = 'In Progress'
+        cls.issue.save()
+        Comment.objects.create(issue=cls.issue, user=cls.users['citizen'], text='Same here.')
+        cls.campaign = Campaign.objects.create(
+            title='School benches', description='Details', ngo=cls.users['ngo'], category='Education',
+            goal_amount=1000, is_verified=True,
+        )
+        Donation.objects.create(campaign=cls.campaign, donor=cls.users['citizen'], amount=10)
+        TransparencyReport.objects.create(title='Q1', description='Details')
+
+    def setUp(self):
+        cache.clear()  # a cached response would run no queries to check
+
+    def select_queries(self, path, user):
+        queries = []
+
+        def record(execute, sql, params, many, context):
+            if sql.lstrip().upper().startswith('SELECT'):
+                queries.append((sql, params))
+            return execute(sql, params, many, context)
+
+        self.client.force_authenticate(self.users[user] if user else None)
+        with connection.execute_wrapper(record):
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200, path)
+        return queries
+
+    def test_endpoints_use_indexes(self):
+        for template, user, allowed in self.ENDPOINTS:
+            path = template.format(issue=self.issue.pk, campaign=self.campaign.pk)
+            with self.subTest(path=path, user=user):
+                queries = self.select_queries(path, user)
+                self.assertTrue(queries, 'no queries captured')
+                for sql, params in queries:
+                    with connection.cursor() as cursor:
+                        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+                        plan = [row[-1] for row in cursor.fetchall()]
+                    scans = [m.group(1) for m in map(FULL_SCAN.match, plan) if m and m.group(1) not in allowed]
+                    self.assertFalse(scans, f'full scan of {", ".join(scans)}:\n{sql}\n' + '\n'.join(plan))
+
+
+class IssueCursorPaginationTests(APITestCase):
+    def test_search_ranking_cannot_be_paged_by_cursor(self):
+        response = self.client.get('/api/issues/?search=water&pagination=cursor')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('pagination', response.json())
+        response = self.client.get('/api/issues/?search=water&pagination=cursor&ordering=-created_at')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('next', response.json())
+        self.assertNotIn('count', response.json())
+
+
+class MapClusterTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = make_user('author@example.com')
+        for index in range(3):
+            Issue.objects.create(
+                title=f'Issue {index}', description='Details', location='Model Town', category='Roads',
+                author=author, latitude=31.505 + index * 0.001, longitude=74.305,
+            )
+
+    def test_zoomed_out_map_over_a_small_bbox(self):
+        for zoom, bbox in ((3, '74.3,31.5,74.31,31.51'), (-5, '74.0,31.0,75.0,32.0'), (12, '74.3,31.5,74.31,31.51')):
+            with self.subTest(zoom=zoom, bbox=bbox):
+                response = self.client.get(f'/api/issues/clusters/?zoom={zoom}&bbox={bbox}')
+                self.assertEqual(response.status_code, 200)
+                clusters = response.json()['clusters']
+                self.assertEqual(sum(cluster['count'] for cluster in clusters), 3)
+
+
+class ConditionalGetTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = make_user('author@example.com', first_name='Ali')
+        cls.issue = Issue.objects.create(
+            title='Deep pothole', description='Details', location='Model Town', category='Roads', author=cls.author,
+        )
+
+    def assertNotModified(self, path, etag, expected=True):
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304 if expected else 200)
+        return response
+
+    def test_list_sees_writes_that_skip_this_process_cache(self):
+        etag = self.client.get('/api/issues/')['ETag']
+        self.assertNotModified('/api/issues/', etag)
+        # Like a write from another worker or a management command: no version bump here
+        Issue.objects.filter(pk=self.issue.pk).update(title='Deeper pothole', updated_at=timezone.now())
+        self.assertNotModified('/api/issues/', etag, expected=False)
+
+    def test_detail_changes_when_the_author_is_renamed(self):
+        path = f'/api/issues/{self.issue.pk}/'
+        response = self.client.get(path)
+        self.assertNotIn('Last-Modified', response)
+        self.author.first_name = 'Sara'
+        self.author.save()
+        response = self.assertNotModified(path, response['ETag'], expected=False)
+        self.assertEqual(response.json()['author_name'], 'Sara')
+
+
+class IssueSaveTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('citizen@example.com')
+        cls.issue = Issue.objects.create(
+            title='Deep pothole', description='Details', location='Model Town', category='Roads', author=cls.user,
+        )
+
+    def test_saves_after_refresh_write_only_local_changes(self):
+        issue = Issue.objects.get(pk=self.issue.pk)
+        Issue.objects.filter(pk=issue.pk).update(title='Renamed elsewhere')
+        issue.refresh_from_db()
+        self.assertEqual(issue.get_dirty_fields(), [])
+        issue.add_upvote(self.user)
+        self.assertEqual(issue.get_dirty_fields(), [])
+        # Another voter arrives; this instance's upvotes must not be written back
+        issue.add_upvote(make_user('other@example.com'))
+        stale = Issue.objects.get(pk=issue.pk)
+        stale.upvotes = 0
+        stale.refresh_from_db(fields=['upvotes'])
+        issue.remove_upvote(self.user)
+        issue.location = 'Gulberg'
+        issue.save()
+        issue.refresh_from_db()
+        self.assertEqual((issue.upvotes, issue.title, issue.location), (1, 'Renamed elsewhere', 'Gulberg'))
+        self.assertEqual(stale.get_dirty_fields(), [])
+
+    def test_explicit_update_fields_always_saves(self):
+        issue = Issue.objects.get(pk=self.issue.pk)
+        received = []
+        post_save.connect(lambda instance, **kwargs: received.append(kwargs['update_fields']), sender=Issue,
+                          weak=False, dispatch_uid='test-explicit-save')
+        self.addCleanup(post_save.disconnect, sender=Issue, dispatch_uid='test-explicit-save')
+        with self.assertNumQueries(1):
+            issue.save(update_fields=['title'])
+        issue.save()  # nothing changed: no query, no signal
+        self.assertEqual(received, [frozenset({'title'})])
+
+
+class ResponseCacheStatsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_staff_read_the_counters_of_this_process(self):
+        self.client.get('/api/issues/')
+        self.client.get('/api/issues/')
+        self.client.force_authenticate(make_user('citizen@example.com'))
+        self.assertEqual(self.client.get('/api/cache/stats/').status_code, 403)
+        self.client.force_authenticate(make_user('staff@example.com', is_staff=True))
+        response = self.client.get('/api/cache/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['endpoints']['issue-list'], {'hits': 1, 'misses': 1})
+        self.assertEqual(self.client.delete('/api/cache/stats/').status_code, 204)
+        self.assertEqual(self.client.get('/api/cache/stats/').json()['endpoints']['issue-list'], {'hits': 0, 'misses': 0})
+
+
+@override_settings(UPVOTE_WRITE_BEHIND=True)
+class UpvoteWriteBehindTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('citizen@example.com')
+        cls.issue = Issue.objects.create(
+            title='Deep pothole', description='Details', location='Model Town', category='Roads', author=cls.user,
+        )
+        cls.issue.add_upvote(make_user('neighbour@example.com'))
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_buffered_vote_is_applied_by_flush_upvotes(self):
+        path = f'/api/issues/{self.issue.pk}/upvote/'
+        for expected in (2, 2):  # a repeated click changes nothing
+            response = self.client.post(path)
+            self.assertEqual(response.status_code, 202)
+            self.assertEqual(response.json()['upvotes'], expected)
+        self.issue.refresh_from_db()
+        self.assertEqual(self.issue.upvotes, 1)
+
+        call_command('flush_upvotes', stdout=StringIO())
+        self.issue.refresh_from_db()
+        self.assertEqual(self.issue.upvotes, 2)
+        self.assertTrue(self.issue.upvote_records.filter(user=self.user).exists())
+
+        response = self.client.post(f'/api/issues/{self.issue.pk}/remove_upvote/')
+        self.assertEqual((response.status_code, response.json()['upvotes']), (202, 1))
+        call_command('flush_upvotes', stdout=StringIO())
+        self.issue.refresh_from_db()
+        self.assertEqual(self.issue.upvotes, 1)
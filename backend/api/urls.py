@@ -3,7 +3,8 @@ from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenRefreshView
 from .views import (
     RegisterView, CustomTokenObtainPairView, UserViewSet, IssueViewSet, CampaignViewSet,
-    DonationViewSet, TransparencyReportViewSet, DashboardStatsView, TransparencySummaryView
+    DonationViewSet, TransparencyReportViewSet, DashboardStatsView, TransparencySummaryView,
+    ResponseCacheStatsView,
 )
 
 router = DefaultRouter()
@@ -21,6 +22,8 @@ urlpatterns = [
     
     # Dashboard Stats (Private)
     path('dashboard/stats/', DashboardStatsView.as_view(), name='dashboard-stats'),
+    # Response cache hit/miss counters (staff)
+    path('cache/stats/', ResponseCacheStatsView.as_view(), name='response-cache-stats'),
 
     # Transparency Summary (Public) -> THIS WAS MISSING
     path('transparency/summary/', TransparencySummaryView.as_view(), name='transparency-summary'),
@@ -1,23 +1,32 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView
 from .serializers import CustomTokenObtainPairSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework.exceptions import PermissionDenied
-from django.db.models import Q, Count, Sum
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from django.db.models import Q, Count, Sum, Exists, OuterRef, Prefetch
+from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
+import heapq
+import math
 
+from . import cache, geo, search, settlements
+from .cache import cached_response
+from .conditional import conditional_get
+from .pagination import CommentPagination, DonationPagination, IssuePagination, TimelinePagination
+from .replicas import ReplicaReadMixin
 from .models import (
-    User, Issue, IssueUpvote, IssueTimeline,
+    User, Issue, IssueUpvote, PendingUpvote, IssueTimeline, IssueStatusCount, MapCluster,
     Campaign, BudgetItem, Donation, TransparencyReport
 )
 from .serializers import (
     UserSerializer, UserRegistrationSerializer, CustomTokenObtainPairSerializer,
-    IssueSerializer, IssueCreateSerializer,
-    CampaignSerializer, CampaignCreateSerializer,
+    IssueSerializer, IssueListSerializer, IssueCreateSerializer,
+    CampaignSerializer, CampaignCardSerializer, CampaignCreateSerializer,
     DonationSerializer, BudgetItemSerializer,
     TransparencyReportSerializer, IssueTimelineSerializer
 )
@@ -66,18 +75,27 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class IssueViewSet(viewsets.ModelViewSet):
+class IssueViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """Issue viewset"""
     queryset = Issue.objects.all()
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = IssuePagination
     filterset_fields = ['category', 'status', 'priority']
     search_fields = ['title', 'description', 'location']
-    ordering_fields = ['created_at', 'upvotes']
+    search_fts_table = search.ISSUE_FTS
+    search_fts_weights = search.ISSUE_WEIGHTS
+    ordering_fields = ['created_at', 'upvotes', 'hot_score']
+    ordering_aliases = {'hot': ['-hot_score']}
     ordering = ['-created_at']
+    # Timeline entries embedded per issue in list responses (?expand=timeline)
+    timeline_preview_length = 5
+    replica_actions = {'list', 'retrieve', 'stats'}
     
     def get_serializer_class(self):
         if self.action == 'create':
             return IssueCreateSerializer
+        if self.action in ('list', 'nearby'):
+            return IssueListSerializer
         return IssueSerializer
     
     def get_serializer_context(self):
@@ -104,7 +122,67 @@ class IssueViewSet(viewsets.ModelViewSet):
         if self.request.query_params.get('my_reports', None):
             queryset = queryset.filter(author=self.request.user)
         
-        return queryset.select_related('author', 'resolved_by').prefetch_related('timeline')
+        bbox = self.request.query_params.get('bbox', None)
+        if bbox:
+            queryset = geo.filter_bounds(queryset, *self.parse_bbox(bbox))
+        
+        # Lists only load what the requested fields need
+        if self.action in ('list', 'nearby'):
+            fields = IssueListSerializer.requested_fields(self.request)
+        elif self.action in ('upvote', 'remove_upvote', 'comments', 'timeline'):
+            # Only the row's existence matters for votes, comments and history
+            fields = set()
+        else:
+            fields = set(IssueSerializer.Meta.fields)
+        
+        # Resolve upvote membership for the whole page in the main query
+        # instead of one EXISTS lookup per serialized issue.
+        if 'user_has_upvoted' in fields and self.request.user.is_authenticated:
+            queryset = queryset.annotate(user_has_upvoted=Exists(
+                IssueUpvote.objects.filter(issue=OuterRef('pk'), user=self.request.user)
+            ))
+        
+        if 'description' not in fields:
+            queryset = queryset.defer('description')
+        if fields & {'author_email', 'author_name'}:
+            queryset = queryset.select_related('author')
+        if 'timeline' in fields:
+            timeline = IssueTimeline.objects.select_related('created_by').order_by('-created_at', '-id')
+            if self.action in ('list', 'nearby'):
+                # Cards only show recent activity; the sliced prefetch is a
+                # ROW_NUMBER() window per issue, so long histories stay in the DB.
+                # Sliced prefetches must use to_attr (read by IssueListSerializer).
+                queryset = queryset.prefetch_related(Prefetch(
+                    'timeline', queryset=timeline[:self.timeline_preview_length], to_attr='recent_timeline'
+                ))
+            else:
+                queryset = queryset.prefetch_related(Prefetch('timeline', queryset=timeline))
+        
+        return queryset
+    
+    def parse_bbox(self, bbox):
+        """Parse `min_lng,min_lat,max_lng,max_lat` into geo.filter_bounds order"""
+        try:
+            min_lng, min_lat, max_lng, max_lat = (float(v) for v in bbox.split(','))
+        except ValueError:
+            raise ValidationError({'bbox': 'Expected min_lng,min_lat,max_lng,max_lat.'})
+        # float() accepts nan and inf, which the geohash cell maths cannot handle
+        if not all(math.isfinite(v) for v in (min_lng, min_lat, max_lng, max_lat)):
+            raise ValidationError({'bbox': 'Coordinates must be finite numbers.'})
+        if not (-90 <= min_lat <= 90 and -90 <= max_lat <= 90 and -180 <= min_lng <= 180 and -180 <= max_lng <= 180):
+            raise ValidationError({'bbox': 'Latitudes must be within ±90 and longitudes within ±180.'})
+        if min_lat > max_lat or min_lng > max_lng:
+            raise ValidationError({'bbox': 'Minimum corner must be south-west of the maximum corner.'})
+        return min_lat, min_lng, max_lat, max_lng
+    
+    @conditional_get(['issues'])
+    @cached_response('issue-list', ['issues'])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @conditional_get(['issues'])
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
     
     def perform_create(self, serializer):
         print(f"DEBUG: Creating issue for user {self.request.user.email}")
@@ -113,27 +191,26 @@ class IssueViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'])
     def upvote(self, request, pk=None):
         issue = self.get_object()
-        upvote, created = IssueUpvote.objects.get_or_create(
-            user=request.user,
-            issue=issue
-        )
+        if settings.UPVOTE_WRITE_BEHIND:
+            PendingUpvote.enqueue(issue, request.user, PendingUpvote.UPVOTE)
+            upvotes = PendingUpvote.projected_upvotes(issue.pk)
+            return Response({'message': 'Upvote queued', 'upvotes': upvotes}, status=status.HTTP_202_ACCEPTED)
+        created, upvotes = issue.add_upvote(request.user)
         if created:
-            issue.upvotes += 1
-            issue.save()
-            return Response({'message': 'Upvoted successfully', 'upvotes': issue.upvotes})
-        return Response({'message': 'Already upvoted', 'upvotes': issue.upvotes})
+            return Response({'message': 'Upvoted successfully', 'upvotes': upvotes})
+        return Response({'message': 'Already upvoted', 'upvotes': upvotes})
     
     @action(detail=True, methods=['post'])
     def remove_upvote(self, request, pk=None):
         issue = self.get_object()
-        try:
-            upvote = IssueUpvote.objects.get(user=request.user, issue=issue)
-            upvote.delete()
-            issue.upvotes = max(0, issue.upvotes - 1)
-            issue.save()
-            return Response({'message': 'Upvote removed', 'upvotes': issue.upvotes})
-        except IssueUpvote.DoesNotExist:
-            return Response({'message': 'No upvote to remove'}, status=status.HTTP_400_BAD_REQUEST)
+        if settings.UPVOTE_WRITE_BEHIND:
+            PendingUpvote.enqueue(issue, request.user, PendingUpvote.REMOVE)
+            upvotes = PendingUpvote.projected_upvotes(issue.pk)
+            return Response({'message': 'Upvote removal queued', 'upvotes': upvotes}, status=status.HTTP_202_ACCEPTED)
+        removed, upvotes = issue.remove_upvote(request.user)
+        if removed:
+            return Response({'message': 'Upvote removed', 'upvotes': upvotes})
+        return Response({'message': 'No upvote to remove'}, status=status.HTTP_400_BAD_REQUEST)
     
     @action(detail=True, methods=['get', 'post'])
     def comments(self, request, pk=None):
@@ -148,9 +225,21 @@ class IssueViewSet(viewsets.ModelViewSet):
         
         from .models import Comment
         from .serializers import CommentSerializer
-        comments = Comment.objects.filter(issue=issue).order_by('-created_at')
-        serializer = CommentSerializer(comments, many=True, context={'request': request})
-        return Response(serializer.data)
+        comments = Comment.objects.filter(issue=issue).select_related('user').order_by('-created_at')
+        paginator = CommentPagination()
+        page = paginator.paginate_queryset(comments, request, view=self)
+        serializer = CommentSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
+    
+    @action(detail=True, methods=['get'])
+    def timeline(self, request, pk=None):
+        """Full status history of an issue, newest first, in cursor pages"""
+        issue = self.get_object()
+        entries = IssueTimeline.objects.filter(issue=issue).select_related('created_by').order_by('-created_at')
+        paginator = TimelinePagination()
+        page = paginator.paginate_queryset(entries, request, view=self)
+        serializer = IssueTimelineSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
         
     @action(detail=True, methods=['post'])
     def delete_comment(self, request, pk=None):
@@ -161,7 +250,7 @@ class IssueViewSet(viewsets.ModelViewSet):
         from .models import Comment
         try:
             comment = Comment.objects.get(id=comment_id, issue_id=pk)
-            if comment.user != request.user and request.user.role != 'official':
+            if comment.user_id != request.user.pk and request.user.role != 'official':
                 return Response({'error': 'You do not have permission to delete this comment'}, status=status.HTTP_403_FORBIDDEN)
                 
             comment.delete()
@@ -191,12 +280,97 @@ class IssueViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(issue)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'])
+    def nearby(self, request):
+        """Nearest issues to ?lat=&lng= within ?radius= km, ordered by distance"""
+        try:
+            lat = float(request.query_params['lat'])
+            lng = float(request.query_params['lng'])
+            radius = float(request.query_params.get('radius', 2))
+            limit = int(request.query_params.get('limit', 20))
+            if math.isnan(radius):
+                raise ValueError
+        except (KeyError, ValueError):
+            return Response({'error': 'lat and lng are required; radius and limit must be numbers'}, status=status.HTTP_400_BAD_REQUEST)
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            return Response({'error': 'lat must be within ±90 and lng within ±180'}, status=status.HTTP_400_BAD_REQUEST)
+        radius = max(0.0, min(radius, 50.0))
+        limit = max(1, min(limit, 100))
+        
+        # Geohash ranges narrow the scan to the circle's bounding cells; only
+        # coordinates are loaded until the nearest ids are known.
+        queryset = self.filter_queryset(self.get_queryset())
+        candidates = geo.filter_bounds(queryset, *geo.radius_bounds(lat, lng, radius))
+        distances = []
+        for pk, issue_lat, issue_lng in candidates.order_by().values_list('id', 'latitude', 'longitude'):
+            distance = geo.haversine_km(lat, lng, issue_lat, issue_lng)
+            if distance <= radius:
+                distances.append((distance, pk))
+        nearest = heapq.nsmallest(limit, distances)
+        
+        issues = queryset.in_bulk([pk for _, pk in nearest])
+        results = []
+        for distance, pk in nearest:
+            data = self.get_serializer(issues[pk]).data
+            data['distance_km'] = round(distance, 3)
+            results.append(data)
+        return Response({'results': results})
+    
+    @action(detail=False, methods=['get'], permission_classes=[permissions.AllowAny])
+    def clusters(self, request):
+        """Aggregated map markers for ?zoom= over the ?bbox= viewport"""
+        try:
+            zoom = int(request.query_params.get('zoom', 12))
+        except ValueError:
+            return Response({'error': 'zoom must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        bbox = request.query_params.get('bbox', None)
+        if not bbox:
+            return Response({'error': 'bbox is required'}, status=status.HTTP_400_BAD_REQUEST)
+        min_lat, min_lng, max_lat, max_lng = self.parse_bbox(bbox)
+        
+        # Roughly one geohash character per two to three zoom levels
+        precision = min(max(MapCluster.CLUSTER_PRECISIONS), max(1, (zoom + 1) * 2 // 5))
+        cells_q = Q()
+        cells = geo.covering_cells(min_lat, min_lng, max_lat, max_lng, max_precision=precision)
+        for start, end in geo.cell_ranges(cells):
+            cells_q |= Q(cell__gte=start, cell__lt=end) if end else Q(cell__gte=start)
+        rows = MapCluster.objects.filter(cells_q, precision=precision, count__gt=0).values_list(
+            'cell', 'category', 'status', 'count', 'latitude_sum', 'longitude_sum'
+        )
+        
+        clusters = {}
+        for cell, category, issue_status, count, lat_sum, lng_sum in rows:
+            cluster = clusters.setdefault(cell, {
+                'cell': cell, 'count': 0, 'lat_sum': 0.0, 'lng_sum': 0.0,
+                'categories': {}, 'statuses': {},
+            })
+            cluster['count'] += count
+            cluster['lat_sum'] += lat_sum
+            cluster['lng_sum'] += lng_sum
+            cluster['categories'][category] = cluster['categories'].get(category, 0) + count
+            cluster['statuses'][issue_status] = cluster['statuses'].get(issue_status, 0) + count
+        
+        results = []
+        for cluster in clusters.values():
+            count = cluster['count']
+            results.append({
+                'cell': cluster['cell'],
+                'count': count,
+                'latitude': round(cluster.pop('lat_sum') / count, 6),
+                'longitude': round(cluster.pop('lng_sum') / count, 6),
+                'dominant_category': max(cluster['categories'], key=cluster['categories'].get),
+                'statuses': cluster['statuses'],
+            })
+        return Response({'zoom': zoom, 'precision': precision, 'clusters': results})
+    
     @action(detail=False, methods=['get'], permission_classes=[permissions.AllowAny])
+    @cached_response('issue-stats', ['issues'], anonymous_only=False)
     def stats(self, request):
-        total = Issue.objects.count()
-        resolved = Issue.objects.filter(status='Resolved').count()
-        in_progress = Issue.objects.filter(status='In Progress').count()
-        active = Issue.objects.exclude(status__in=['Resolved', 'Rejected']).count()
+        counts = IssueStatusCount.by_status()
+        total = sum(counts.values())
+        resolved = counts['Resolved']
+        in_progress = counts['In Progress']
+        active = total - resolved - counts['Rejected']
         
         # Calculate resolution rate safely
         resolution_rate = round((resolved / total * 100) if total > 0 else 0, 2)
@@ -210,25 +384,46 @@ class IssueViewSet(viewsets.ModelViewSet):
         })
 
 
-class CampaignViewSet(viewsets.ModelViewSet):
+class CampaignViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """Campaign viewset"""
     queryset = Campaign.objects.all()
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filterset_fields = ['category', 'is_verified', 'is_active']
     search_fields = ['title', 'description', 'ngo__organization_name']
-    ordering_fields = ['created_at', 'raised_amount']
+    search_fts_table = search.CAMPAIGN_FTS
+    search_fts_weights = search.CAMPAIGN_WEIGHTS
+    ordering_fields = ['created_at', 'raised_amount', 'trending_score']
+    ordering_aliases = {'trending': ['-trending_score']}
     ordering = ['-created_at']
+    replica_actions = {'list', 'retrieve'}
     
     def get_serializer_class(self):
         if self.action == 'create':
             return CampaignCreateSerializer
+        if self.action == 'list':
+            return CampaignCardSerializer
         return CampaignSerializer
     
     def get_queryset(self):
         user = self.request.user
         if user.is_authenticated and user.role == 'ngo':
-            return Campaign.objects.filter(ngo=user)
-        return Campaign.objects.filter(is_verified=True)
+            queryset = Campaign.objects.filter(ngo=user)
+        else:
+            queryset = Campaign.objects.filter(is_verified=True)
+        queryset = queryset.select_related('ngo')
+        # Cards leave out the budget breakdown; only full representations load it
+        if self.action not in ('list', 'donations'):
+            queryset = queryset.prefetch_related('budget_items')
+        return queryset
+    
+    @conditional_get(['campaigns'])
+    @cached_response('campaign-list', ['campaigns'])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @conditional_get(['campaigns'])
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
     
     def perform_create(self, serializer):
        if self.request.user.role != 'ngo':
@@ -238,9 +433,11 @@ class CampaignViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def donations(self, request, pk=None):
         campaign = self.get_object()
-        donations = Donation.objects.filter(campaign=campaign).select_related('donor')
-        serializer = DonationSerializer(donations, many=True, context={'request': request})
-        return Response(serializer.data)
+        donations = Donation.objects.filter(campaign=campaign).select_related('donor', 'campaign').order_by('-created_at')
+        paginator = DonationPagination()
+        page = paginator.paginate_queryset(donations, request, view=self)
+        serializer = DonationSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
 
 
 class DonationViewSet(viewsets.ModelViewSet):
@@ -260,6 +457,33 @@ class DonationViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         serializer.save(donor=self.request.user)
+    
+    @action(detail=False, methods=['post'], permission_classes=[permissions.IsAdminUser],
+            parser_classes=[MultiPartParser])
+    def settlement(self, request):
+        """Import a gateway settlement file uploaded as `file` (CSV or NDJSON)"""
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
+        file_format = request.data.get('file_format') or settlements.guess_format(upload.name)
+        if file_format not in settlements.FORMATS:
+            return Response({'error': 'file_format must be csv or ndjson'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            report = settlements.ingest(settlements.read_rows(settlements.text_stream(upload.file), file_format))
+        except (UnicodeDecodeError, settlements.SettlementError) as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'rows': report['rows'],
+            'created': report['created'],
+            'duplicates': report['duplicates'],
+            'rejected': [{'line': line, 'reason': reason} for line, reason in report['rejected']],
+            'amount': str(report['amount']),
+            'campaigns': report['campaigns'],
+            'seconds': round(report['seconds'], 3),
+            'rows_per_second': round(report['rows_per_second']),
+        })
 
 
 class TransparencyReportViewSet(viewsets.ModelViewSet):
@@ -276,16 +500,22 @@ class TransparencyReportViewSet(viewsets.ModelViewSet):
         serializer.save(created_by=self.request.user)
 
 
-class DashboardStatsView(APIView):
+class DashboardStatsView(ReplicaReadMixin, APIView):
     """Dashboard statistics endpoint"""
     permission_classes = [permissions.IsAuthenticated]
     
     def get(self, request):
-        total_issues = Issue.objects.count()
-        resolved_issues = Issue.objects.filter(status='Resolved').count()
-        active_issues = Issue.objects.exclude(status__in=['Resolved', 'Rejected']).count()
-        total_campaigns = Campaign.objects.filter(is_active=True).count()
-        total_raised = Donation.objects.aggregate(total=Sum('amount'))['total'] or 0
+        counts = IssueStatusCount.by_status()
+        total_issues = sum(counts.values())
+        resolved_issues = counts['Resolved']
+        active_issues = total_issues - resolved_issues - counts['Rejected']
+        # Campaign.raised_amount already totals each campaign's donations
+        campaign_totals = Campaign.objects.aggregate(
+            active=Count('id', filter=Q(is_active=True)),
+            raised=Sum('raised_amount'),
+        )
+        total_campaigns = campaign_totals['active']
+        total_raised = campaign_totals['raised'] or 0
         total_users = User.objects.count()
         
         return Response({
@@ -305,17 +535,19 @@ class DashboardStatsView(APIView):
         })
 
 # --- MISSING VIEW ADDED HERE ---
-class TransparencySummaryView(APIView):
+class TransparencySummaryView(ReplicaReadMixin, APIView):
     """Public endpoint for aggregated financial data"""
     permission_classes = [permissions.AllowAny]
 
+    @cached_response('transparency-summary', ['campaigns'], anonymous_only=False)
     def get(self, request):
         # 1. Total Funds Donated
         total_raised = Campaign.objects.filter(is_verified=True).aggregate(Sum('raised_amount'))['raised_amount__sum'] or 0
 
         # 2. Funds Utilized (Mock logic: Sum of budgets for completed campaigns)
-        # Ideally, add a 'funds_spent' field to your Campaign model for real tracking
-        funds_utilized = Campaign.objects.filter(status='completed').aggregate(Sum('raised_amount'))['raised_amount__sum'] or 0
+        # Ideally, add a 'funds_spent' field to your Campaign model for real tracking.
+        # Campaign has no status field; closed (inactive) campaigns count as completed.
+        funds_utilized = Campaign.objects.filter(is_verified=True, is_active=False).aggregate(Sum('raised_amount'))['raised_amount__sum'] or 0
 
         # 3. Available Balance
         available_balance = total_raised - funds_utilized
@@ -324,4 +556,24 @@ class TransparencySummaryView(APIView):
             "total_funds_donated": total_raised,
             "funds_utilized": funds_utilized,
             "available_balance": available_balance
-        })
\ No newline at end of file
+        })
+
+
+class ResponseCacheStatsView(APIView):
+    """
+    Hit/miss counters of the response cache, read inside the server.
+
+    With a per-process cache backend every worker keeps its own counters, so
+    this reports the worker that served the request (`shared` is false).
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            'shared': cache.is_shared(),
+            'endpoints': cache.get_stats(cache.CACHED_ENDPOINTS),
+        })
+
+    def delete(self, request):
+        cache.reset_stats(cache.CACHED_ENDPOINTS)
+        return Response(status=status.HTTP_204_NO_CONTENT)
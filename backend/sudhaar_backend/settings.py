@@ -41,12 +41,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost, so its timings cover the whole stack; a no-op unless SQL_INSTRUMENTATION
+    'api.instrumentation.SQLInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # A no-op unless DATABASE_REPLICAS is set
+    'api.replicas.ReplicaPinMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -82,6 +86,46 @@ DATABASES = {
     }
 }
 
+# PRAGMAs run on every new SQLite connection (see api/sqlite.py)
+SQLITE_PRAGMAS = {}
+SQLITE_PRODUCTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,              # milliseconds
+    'mmap_size': 256 * 1024 * 1024,    # bytes
+    'cache_size': -64 * 1024,          # negative means KiB: 64 MiB per connection
+    'temp_store': 'MEMORY',
+}
+
+# DATABASE_PROFILE=production tunes SQLite for concurrent requests: WAL lets
+# readers proceed while a write is in progress, synchronous=NORMAL is durable
+# in WAL mode without an fsync per commit, and busy_timeout makes writers
+# queue instead of failing with "database is locked". Connections are kept
+# for CONN_MAX_AGE seconds so the PRAGMAs and mmap are set up once per worker.
+DATABASE_PROFILE = os.environ.get('DATABASE_PROFILE', 'development')
+if DATABASE_PROFILE == 'production':
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+    })
+    SQLITE_PRAGMAS = SQLITE_PRODUCTION_PRAGMAS
+
+# Read replicas
+# Aliases in DATABASE_REPLICAS serve the safe reads of views using
+# api.replicas.ReplicaReadMixin; everything else uses `default`. A user who
+# just wrote reads from `default` for REPLICA_PIN_SECONDS. SQLITE_REPLICA=1
+# adds a local replica file, kept in sync by `python manage.py sync_replica`.
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+DATABASE_REPLICAS = []
+REPLICA_PIN_SECONDS = 5
+if os.environ.get('SQLITE_REPLICA', '') == '1':
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': BASE_DIR / 'db.replica.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS = ['replica']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -143,11 +187,53 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
-        'rest_framework.filters.SearchFilter',
-        'rest_framework.filters.OrderingFilter',
+        'api.filters.FullTextSearchFilter',
+        'api.filters.RankedOrderingFilter',
     ],
 }
 
+# Cache
+# Local memory is per process; to share cached responses between workers use
+# 'django.core.cache.backends.filebased.FileBasedCache' with a LOCATION path.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'sudhaar',
+    }
+}
+
+# Seconds a cached public response may be served; writes invalidate it sooner
+RESPONSE_CACHE_TIMEOUT = 300
+
+# Upvote write-behind buffer
+# When enabled, upvote/remove_upvote only append to a buffer table and
+# `python manage.py flush_upvotes --loop` applies the votes in batches; the
+# flusher must run whenever this is on. A vote arriving while the oldest
+# buffered one is older than UPVOTE_FLUSH_MAX_LAG seconds flushes inline.
+UPVOTE_WRITE_BEHIND = os.environ.get('UPVOTE_WRITE_BEHIND', '') == '1'
+UPVOTE_FLUSH_MAX_LAG = 10
+UPVOTE_FLUSH_INTERVAL = 2
+UPVOTE_FLUSH_BATCH_SIZE = 1000
+
+# Per-request SQL instrumentation
+# When enabled, responses carry a Server-Timing header with DB time and query
+# count, and every request logs one JSON line to the `api.sql` logger. Requests
+# that run the same SQL shape more than SQL_REPEAT_THRESHOLD times (an N+1)
+# are logged at WARNING.
+SQL_INSTRUMENTATION = os.environ.get('SQL_INSTRUMENTATION', '') == '1'
+SQL_REPEAT_THRESHOLD = int(os.environ.get('SQL_REPEAT_THRESHOLD', '5'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'api.sql': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
@@ -16,6 +16,12 @@ interface Donation {
     created_at: string;
 }
 
+interface DonationPage {
+    next: string | null;
+    previous: string | null;
+    results: Donation[];
+}
+
 interface Campaign {
     id: number;
     title: string;
@@ -35,6 +41,8 @@ export default function CampaignDetails() {
     const navigate = useNavigate();
     const [campaign, setCampaign] = useState<Campaign | null>(null);
     const [donations, setDonations] = useState<Donation[]>([]);
+    const [nextDonationsCursor, setNextDonationsCursor] = useState<string | null>(null);
+    const [isLoadingDonations, setIsLoadingDonations] = useState(false);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
 
@@ -56,12 +64,8 @@ export default function CampaignDetails() {
                 setCampaign(campaignResponse.data);
             }
 
-            // Fetch donations for this campaign
-            const donationsResponse = await apiService.get<Donation[]>(`${API_ENDPOINTS.CAMPAIGNS}${id}/donations/`);
-
-            if (donationsResponse.data) {
-                setDonations(Array.isArray(donationsResponse.data) ? donationsResponse.data : []);
-            }
+            // Fetch the newest page of donations for this campaign
+            await fetchDonations();
         } catch (err) {
             console.error("Fetch Error:", err);
             setError("Failed to load campaign details");
@@ -70,6 +74,24 @@ export default function CampaignDetails() {
         }
     };
 
+    const fetchDonations = async (cursor?: string) => {
+        setIsLoadingDonations(true);
+        try {
+            const url = cursor
+                ? `${API_ENDPOINTS.CAMPAIGNS}${id}/donations/?cursor=${encodeURIComponent(cursor)}`
+                : `${API_ENDPOINTS.CAMPAIGNS}${id}/donations/`;
+            const donationsResponse = await apiService.get<DonationPage>(url);
+
+            if (donationsResponse.data) {
+                const page = donationsResponse.data;
+                setDonations(prev => cursor ? [...prev, ...page.results] : page.results);
+                setNextDonationsCursor(page.next ? new URL(page.next).searchParams.get("cursor") : null);
+            }
+        } finally {
+            setIsLoadingDonations(false);
+        }
+    };
+
     const getImageUrl = (path: string) => {
         if (!path) return '/placeholder-campaign.jpg';
         if (path.startsWith('http')) return path;
@@ -205,7 +227,7 @@ export default function CampaignDetails() {
                 {/* Donations List */}
                 <div className="bg-white rounded-3xl shadow-xl overflow-hidden">
                     <div className="px-8 py-6 border-b border-slate-100">
-                        <h2 className="text-2xl font-black text-slate-900">Donations ({donations.length})</h2>
+                        <h2 className="text-2xl font-black text-slate-900">Donations ({donations.length}{nextDonationsCursor ? '+' : ''})</h2>
                         <p className="text-slate-500 font-medium">Recent contributions to this campaign</p>
                     </div>
 
@@ -262,6 +284,16 @@ export default function CampaignDetails() {
                             </tbody>
                         </table>
                     </div>
+
+                    {nextDonationsCursor && (
+                        <button
+                            onClick={() => fetchDonations(nextDonationsCursor)}
+                            disabled={isLoadingDonations}
+                            className="w-full text-sm font-bold text-slate-500 hover:text-slate-700 py-4 border-t border-slate-100"
+                        >
+                            {isLoadingDonations ? "Loading..." : "Load older donations"}
+                        </button>
+                    )}
                 </div>
             </div>
         </div>
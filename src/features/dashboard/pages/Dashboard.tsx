@@ -55,7 +55,8 @@ export default function Dashboard() {
       const ordering = activeFilter === "Newest" ? "-created_at" : "-upvotes";
       const response = await issuesService.getAll({
         ordering,
-        exclude_resolved: true
+        exclude_resolved: true,
+        expand: "description"
       });
 
       if (response.data) {
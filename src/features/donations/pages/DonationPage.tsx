@@ -38,6 +38,13 @@ interface FormattedCampaign {
   };
 }
 
+const toBudget = (items?: any[]) =>
+  items?.map((b: any) => ({
+    item: b.item_name,
+    cost: parseFloat(b.total_cost || "0"),
+    funded: parseFloat(b.funded_amount || "0")
+  })) || [];
+
 export default function DonationPage() {
   const [selectedCategory, setSelectedCategory] = useState("All");
   const [searchQuery, setSearchQuery] = useState("");
@@ -101,11 +108,8 @@ export default function DonationPage() {
             is_verified: c.is_verified || false,
             zakatEligible: c.zakat_eligible || false,
             daysLeft: daysLeft,
-            budget: c.budget_items?.map((b: any) => ({
-              item: b.item_name,
-              cost: parseFloat(b.total_cost || "0"),
-              funded: parseFloat(b.funded_amount || "0")
-            })) || [],
+            // Budget breakdown is only on the detail endpoint; see openCampaign
+            budget: toBudget(c.budget_items),
             paymentInfo: dynamicPaymentInfo
           };
         });
@@ -120,6 +124,19 @@ export default function DonationPage() {
     }
   };
 
+  const openCampaign = async (camp: FormattedCampaign) => {
+    setSelectedCampaign(camp);
+    try {
+      const response = await campaignsService.getById(Number(camp.id));
+      if (response.data) {
+        const budget = toBudget(response.data.budget_items);
+        setSelectedCampaign(prev => (prev && prev.id === camp.id ? { ...prev, budget } : prev));
+      }
+    } catch (err) {
+      console.error("Error loading campaign budget:", err);
+    }
+  };
+
   const categories = useMemo(() => {
     const uniqueCats = Array.from(new Set(campaigns.map(c => c.category)));
     return ["All", ...uniqueCats];
@@ -216,7 +233,7 @@ export default function DonationPage() {
                     animate={{ opacity: 1, scale: 1 }}
                     exit={{ opacity: 0, scale: 0.9 }}
                     key={camp.id}
-                    onClick={() => setSelectedCampaign(camp)}
+                    onClick={() => openCampaign(camp)}
                     className="group bg-white rounded-3xl border border-slate-100 shadow-sm hover:shadow-xl hover:-translate-y-1 transition-all duration-300 cursor-pointer overflow-hidden flex flex-col"
                   >
                     <div className="h-48 overflow-hidden relative">
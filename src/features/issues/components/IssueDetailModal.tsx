@@ -18,6 +18,7 @@ export default function IssueDetailModal({ issue, onClose }: { issue: Issue | nu
   const [isCopied, setIsCopied] = useState(false);
   const [isVoting, setIsVoting] = useState(false);
   const [isLoadingComments, setIsLoadingComments] = useState(false);
+  const [nextCommentsCursor, setNextCommentsCursor] = useState<string | null>(null);
 
   useEffect(() => {
     if (issue) {
@@ -30,13 +31,15 @@ export default function IssueDetailModal({ issue, onClose }: { issue: Issue | nu
     }
   }, [issue]);
 
-  const fetchComments = async () => {
+  const fetchComments = async (cursor?: string) => {
     if (!issue) return;
     setIsLoadingComments(true);
     try {
-      const response = await issuesService.getComments(issue.id);
+      const response = await issuesService.getComments(issue.id, cursor);
       if (response.data) {
-        setComments(response.data);
+        const page = response.data;
+        setComments(prev => cursor ? [...prev, ...page.results] : page.results);
+        setNextCommentsCursor(page.next ? new URL(page.next).searchParams.get("cursor") : null);
       }
     } catch (err) {
       console.error("Failed to fetch comments:", err);
@@ -185,7 +188,7 @@ export default function IssueDetailModal({ issue, onClose }: { issue: Issue | nu
             </div>
 
             <div className="space-y-4">
-              {isLoadingComments ? (
+              {isLoadingComments && comments.length === 0 ? (
                 <div className="flex justify-center p-4"><Loader2 className="h-6 w-6 animate-spin text-slate-300" /></div>
               ) : comments.length > 0 ? (
                 comments.map(c => {
@@ -227,6 +230,15 @@ export default function IssueDetailModal({ issue, onClose }: { issue: Issue | nu
               ) : (
                 <p className="text-center text-slate-400 text-sm py-4">No comments yet. Start the conversation!</p>
               )}
+              {nextCommentsCursor && (
+                <button
+                  onClick={() => fetchComments(nextCommentsCursor)}
+                  disabled={isLoadingComments}
+                  className="w-full text-xs font-bold text-slate-500 hover:text-slate-700 py-2"
+                >
+                  {isLoadingComments ? "Loading..." : "Load older comments"}
+                </button>
+              )}
             </div>
           </div>
 
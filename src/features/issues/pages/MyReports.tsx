@@ -73,7 +73,7 @@ export default function MyReports() {
     setIsLoading(true);
     setError(null);
     try {
-      const response = await issuesService.getAll({ my_reports: true });
+      const response = await issuesService.getAll({ my_reports: true, expand: "description" });
       if (response.error) {
         setError(response.error);
       } else if (response.data) {
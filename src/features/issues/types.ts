@@ -24,6 +24,7 @@ export interface Issue {
   image_url?: string; // API returns 'image_url'
   image_url_full?: string; // API returns 'image_url_full'
   upvotes: number;
+  comment_count?: number;
   user_has_upvoted?: boolean;
 
   budget?: {
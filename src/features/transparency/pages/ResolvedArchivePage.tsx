@@ -90,7 +90,8 @@ export default function ResolvedArchivePage() {
     try {
       const response = await issuesService.getAll({ 
         resolved_only: true, 
-        ordering: "-created_at" 
+        ordering: "-created_at",
+        expand: "description"
       });
       
       if (response.error) {
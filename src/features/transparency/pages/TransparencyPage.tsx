@@ -330,7 +330,7 @@ export default function TransparencyPage() {
       // Execute all independent requests in parallel
       const [statsRes, resolvedRes, financialRes, campaignsRes] = await Promise.allSettled([
         issuesService.getStats(),
-        issuesService.getAll({ resolved_only: true, ordering: "-created_at" }),
+        issuesService.getAll({ resolved_only: true, ordering: "-created_at", expand: "description" }),
         apiService.get(API_ENDPOINTS.TRANSPARENCY_SUMMARY),
         campaignsService.getAll({ is_active: true, is_verified: true })
       ]);
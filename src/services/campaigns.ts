@@ -45,6 +45,7 @@ export const campaignsService = {
     is_verified?: boolean;
     is_active?: boolean;
     search?: string;
+    ordering?: string;
   }) {
     const queryParams = new URLSearchParams();
     if (params) {
@@ -107,8 +108,11 @@ export const campaignsService = {
     return apiService.post<Campaign>(API_ENDPOINTS.CAMPAIGNS, data);
   },
 
-  async getDonations(id: number) {
-    return apiService.get(`${API_ENDPOINTS.CAMPAIGNS}${id}/donations/`);
+  async getDonations(id: number, cursor?: string) {
+    const url = cursor
+      ? `${API_ENDPOINTS.CAMPAIGNS}${id}/donations/?cursor=${encodeURIComponent(cursor)}`
+      : `${API_ENDPOINTS.CAMPAIGNS}${id}/donations/`;
+    return apiService.get(url);
   },
 };
 
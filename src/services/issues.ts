@@ -24,6 +24,12 @@ export interface Comment {
   is_own_comment?: boolean;
 }
 
+export interface CommentPage {
+  next: string | null;
+  previous: string | null;
+  results: Comment[];
+}
+
 export const issuesService = {
   async getAll(params?: {
     category?: string;
@@ -34,6 +40,8 @@ export const issuesService = {
     my_reports?: boolean;
     search?: string;
     ordering?: string;
+    fields?: string;
+    expand?: string;
   }) {
     const queryParams = new URLSearchParams();
     if (params) {
@@ -88,8 +96,11 @@ export const issuesService = {
     return apiService.get(API_ENDPOINTS.ISSUE_STATS);
   },
 
-  async getComments(issueId: string | number) {
-    return apiService.get<Comment[]>(`${API_ENDPOINTS.ISSUES}${issueId}/comments/`);
+  async getComments(issueId: string | number, cursor?: string) {
+    const url = cursor
+      ? `${API_ENDPOINTS.ISSUES}${issueId}/comments/?cursor=${encodeURIComponent(cursor)}`
+      : `${API_ENDPOINTS.ISSUES}${issueId}/comments/`;
+    return apiService.get<CommentPage>(url);
   },
 
   async createComment(issueId: string | number, text: string) {